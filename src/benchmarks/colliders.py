@@ -0,0 +1,48 @@
+"""collider_system с сеткой против старого перебора всех коллайдеров для каждого статичного"""
+from src.benchmarks.world import init_headless, create_server_world, measure_ticks, replace_system
+from src.components.base.collider import ColliderComponent
+from src.components.base.position import PositionComponent
+from src.components.base.texture import TextureComponent
+from src.core.entity_component_system import EntityComponentSystem
+from src.systems.base.colliders import collider_system, push_out, DynamicColliderRadius
+
+UNITS_PER_PLAYER = (100, 500, 1000, 2000)
+WARMUP_TICKS = 10
+TICKS = 30
+
+
+def brute_force_collider_system(collider: ColliderComponent, position: PositionComponent,
+                                ecs: EntityComponentSystem, dynamic_colliders: DynamicColliderRadius):
+    if not collider.static:
+        return
+
+    for _, (entity_position, entity_collider, entity_texture) in ecs.get_entities_with_components(
+            (PositionComponent, ColliderComponent, TextureComponent)):
+        if not entity_collider.static:
+            push_out(position, collider, entity_position, entity_collider, entity_texture)
+
+
+def measure(units_per_player: int, broad_phase: bool) -> tuple[float, float]:
+    """Среднее время тика и самой collider_system в миллисекундах"""
+    ecs = create_server_world(units_per_player)
+    if not broad_phase:
+        replace_system(ecs, collider_system, brute_force_collider_system)
+
+    measure_ticks(ecs, WARMUP_TICKS)
+    tick_ms = measure_ticks(ecs, TICKS)
+    system_name = (collider_system if broad_phase else brute_force_collider_system).__name__
+    return tick_ms, ecs.get_system_stats()[system_name]['avg_ms']
+
+
+def run():
+    init_headless()
+    print(f'{"units":>8} {"brute tick, ms":>15} {"grid tick, ms":>14} {"brute system, ms":>17} {"grid system, ms":>16}')
+    for units_per_player in UNITS_PER_PLAYER:
+        brute_tick, brute_system = measure(units_per_player, broad_phase=False)
+        grid_tick, grid_system = measure(units_per_player, broad_phase=True)
+        print(f'{units_per_player * 2:>8} {brute_tick:>15.2f} {grid_tick:>14.2f} '
+              f'{brute_system:>17.3f} {grid_system:>16.3f}')
+
+
+if __name__ == '__main__':
+    run()
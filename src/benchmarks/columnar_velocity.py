@@ -0,0 +1,40 @@
+"""Движение залпа стрел: velocity_system по одной сущности против массивов ColumnarStore"""
+import random
+
+from src.benchmarks.world import init_headless, measure_ticks
+from src.components.base.position import PositionComponent
+from src.components.base.velocity import VelocityComponent
+from src.core.entity_component_system import EntityComponentSystem
+from src.systems.base.velocity import velocity_system, columnar_velocity_system
+
+ARROW_COUNTS = (1000, 10000, 50000)
+TICKS = 20
+
+
+def create_volley_world(arrows_count: int, columnar: bool) -> EntityComponentSystem:
+    random.seed(0)
+    ecs = EntityComponentSystem(columnar=columnar)
+    ecs.init_component(PositionComponent)
+    ecs.init_component(VelocityComponent)
+    if ecs.columnar_store is None:
+        ecs.init_system(velocity_system)
+    else:
+        ecs.init_batch_system(columnar_velocity_system)
+
+    for _ in range(arrows_count):
+        ecs.create_entity([PositionComponent(random.uniform(-500, 500), random.uniform(-500, 500)),
+                           VelocityComponent.create_from_polar_coordinates(2, random.randint(0, 359))])
+    return ecs
+
+
+def run():
+    init_headless()
+    print(f'{"arrows":>8} {"per entity, ms":>15} {"columnar, ms":>13}')
+    for arrows_count in ARROW_COUNTS:
+        per_entity = measure_ticks(create_volley_world(arrows_count, columnar=False), TICKS)
+        columnar = measure_ticks(create_volley_world(arrows_count, columnar=True), TICKS)
+        print(f'{arrows_count:>8} {per_entity:>15.2f} {columnar:>13.3f}')
+
+
+if __name__ == '__main__':
+    run()
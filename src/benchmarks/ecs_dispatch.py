@@ -0,0 +1,28 @@
+"""Сравнение вызова систем по заранее собранному плану со старым вызовом по именам на одном и том же мире"""
+from src.benchmarks.world import init_headless, create_server_world, measure_ticks
+
+UNITS_PER_PLAYER = (50, 200, 500)
+WARMUP_TICKS = 30
+ROUNDS = 5
+TICKS_PER_ROUND = 20
+
+
+def run():
+    init_headless()
+    print(f'{"units":>8} {"kwargs, ms":>12} {"plans, ms":>12} {"speedup":>8}')
+    for units_per_player in UNITS_PER_PLAYER:
+        ecs = create_server_world(units_per_player)
+        measure_ticks(ecs, WARMUP_TICKS)
+
+        times = {False: 0.0, True: 0.0}
+        for _ in range(ROUNDS):
+            for use_dispatch_plans in times:
+                ecs.use_dispatch_plans = use_dispatch_plans
+                times[use_dispatch_plans] += measure_ticks(ecs, TICKS_PER_ROUND) / ROUNDS
+
+        print(f'{units_per_player * 2:>8} {times[False]:>12.2f} {times[True]:>12.2f} '
+              f'{times[False] / times[True]:>7.2f}x')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,31 @@
+"""
+Стоимость separation_system на юнита при росте армий. Плотность юнитов постоянна, как у армий,
+которые растут вширь, поэтому с сеткой соседей стоимость на юнита почти не должна расти
+"""
+import math
+
+from src.benchmarks.world import init_headless, create_server_world, measure_ticks
+from src.systems.base.separation import separation_system
+
+UNITS_PER_PLAYER = (100, 250, 500, 1000, 2000)
+SPREAD_PER_100_UNITS = 250  # полуширина квадрата с армиями для 100 юнитов на игрока
+WARMUP_TICKS = 10
+TICKS = 30
+
+
+def run():
+    init_headless()
+    print(f'{"units":>8} {"tick, ms":>9} {"separation, ms":>15} {"per unit, us":>13}')
+    for units_per_player in UNITS_PER_PLAYER:
+        ecs = create_server_world(units_per_player,
+                                  spread=SPREAD_PER_100_UNITS * math.sqrt(units_per_player / 100))
+        measure_ticks(ecs, WARMUP_TICKS)
+        ecs.profiler.reset()
+        tick_ms = measure_ticks(ecs, TICKS)
+        stats = ecs.get_system_stats()[separation_system.__name__]
+        per_unit_us = stats['avg_ms'] * 1000 / max(stats['entities'], 1)
+        print(f'{units_per_player * 2:>8} {tick_ms:>9.2f} {stats["avg_ms"]:>15.3f} {per_unit_us:>13.2f}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,27 @@
+"""Статистика систем из EntityComponentSystem.get_system_stats на обычном мире, самые долгие сверху"""
+import json
+import sys
+
+from src.benchmarks.world import init_headless, create_server_world, measure_ticks
+
+UNITS_PER_PLAYER = 200
+TICKS = 120
+
+
+def run(as_json: bool = False):
+    init_headless()
+    ecs = create_server_world(UNITS_PER_PLAYER)
+    measure_ticks(ecs, TICKS)
+    stats = dict(sorted(ecs.get_system_stats().items(), key=lambda item: item[1]['avg_ms'], reverse=True))
+    if as_json:
+        print(json.dumps(stats, indent=2))
+        return
+
+    print(f'{"system":>28} {"avg, ms":>8} {"max, ms":>8} {"entities":>9} {"calls":>8}')
+    for system_name, system_stats in stats.items():
+        print(f'{system_name:>28} {system_stats["avg_ms"]:>8.3f} {system_stats["max_ms"]:>8.3f} '
+              f'{system_stats["entities"]:>9.1f} {system_stats["calls"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    run(as_json='--json' in sys.argv)
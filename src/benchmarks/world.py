@@ -0,0 +1,86 @@
+"""
+Мир без окна и звука для замеров производительности.
+Бенчмарки запускаются из корня проекта: python -m src.benchmarks.<имя>
+"""
+import os
+import random
+import time
+from typing import Callable
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from src.components.base.player_owner import PlayerOwnerComponent
+from src.config import config
+from src.core.camera import Camera
+from src.core.entity_component_system import EntityComponentSystem
+from src.core.types import PlayerInfo, PlayerResources
+from src.elements.damage_indicators import DamageIndicators
+from src.entities import create_warrior, create_archer
+from src.entities.resources.worker import create_worker
+from src.server.action_sender import ServerActionSender
+from src.server.ecs_setup import init_server_ecs
+from src.server.level_setup import setup_level
+
+PLAYER_COLORS = ('red', 'blue', 'green', 'yellow')
+HEADLESS_SCREEN_SIZE = (1280, 720)
+
+
+class _DiscardConnection:
+    def send(self, _):
+        pass
+
+
+def init_headless() -> None:
+    pygame.init()
+    config.screen.size = HEADLESS_SCREEN_SIZE
+    pygame.display.set_mode(config.screen.size)
+
+
+def create_players(players_count: int = 2) -> dict[int, PlayerInfo]:
+    return {
+        socket_id: PlayerInfo(socket_id=socket_id, color_name=PLAYER_COLORS[socket_id], nick=f'bench{socket_id}',
+                              resources=PlayerResources(wood=10 ** 6, money=10 ** 6, meat=0, max_meat=10 ** 6))
+        for socket_id in range(players_count)
+    }
+
+
+def create_server_world(units_per_player: int, players_count: int = 2, seed: int = 0,
+                        ecs_factory: Callable[[], EntityComponentSystem] = EntityComponentSystem,
+                        spread: float = 500) -> EntityComponentSystem:
+    """Уровень как у обычной игры плюс армии из воинов, лучников и рабочих в квадрате ±spread вокруг центра"""
+    random.seed(seed)
+    players = create_players(players_count)
+    camera = Camera()
+    camera.set_center((10 ** 6, 10 ** 6))  # звуки слишком далеко, чтобы их проигрывать
+    action_sender = ServerActionSender(_DiscardConnection(), camera, DamageIndicators(camera))
+
+    ecs = ecs_factory()
+    init_server_ecs(ecs, action_sender, players)
+    setup_level(ecs, players)
+
+    factories = (create_warrior, create_archer, create_worker)
+    for player in players.values():
+        owner = PlayerOwnerComponent(color_name=player.color_name, nick=player.nick, socket_id=player.socket_id)
+        for i in range(units_per_player):
+            ecs.create_entity(factories[i % len(factories)](random.uniform(-spread, spread),
+                                                            random.uniform(-spread, spread),
+                                                            owner))
+    return ecs
+
+
+def replace_system(ecs: EntityComponentSystem, system_function: Callable, replacement: Callable) -> None:
+    """Подменяет систему на месте, чтобы сравнить реализации. Параметры у функций должны совпадать"""
+    ecs.systems = {replacement if function is system_function else function: system
+                   for function, system in ecs.systems.items()}
+    ecs.profiler.add_system(replacement.__name__)
+
+
+def measure_ticks(ecs: EntityComponentSystem, ticks: int) -> float:
+    """Среднее время одного тика в миллисекундах"""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        ecs.update()
+    return (time.perf_counter() - start) * 1000 / ticks
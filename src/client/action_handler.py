@@ -6,6 +6,7 @@ from src.core.entity_component_system import EntityComponentSystem
 from src.core.types import PlayerInfo, EntityId
 from src.sound_player import play_sound
 from src.utils.sound_volume import get_sound_volume_from_distance
+from src.utils.unique_id import entity_id_from_wire
 
 
 class ClientActionHandler:
@@ -23,13 +24,27 @@ class ClientActionHandler:
             self.handle_create(args[0])
 
         elif command == ClientCommands.DEAD:
+            args = [entity_id_from_wire(args[0])]
             self.handle_remove(args[0])
 
+        elif command == ClientCommands.CREATE_BATCH:
+            for entity_json in args[0]:
+                self.handle_create(entity_json)
+
+        elif command == ClientCommands.DEAD_BATCH:
+            args = [[entity_id_from_wire(wire_id) for wire_id in args[0]]]
+            for entity_id in args[0]:
+                self.handle_remove(entity_id)
+
         elif command == ClientCommands.RESOURCE_INFO:
             self.handle_player_info_update(args[0])
 
         elif command == ClientCommands.COMPONENT_INFO:
-            self.handle_update_component_info(args[0], args[1], args[2])
+            self.handle_update_component_info(entity_id_from_wire(args[0]), args[1], args[2])
+
+        elif command == ClientCommands.COMPONENT_INFO_BATCH:
+            for wire_id, component_class_name, component_json in args[0]:
+                self.handle_update_component_info(entity_id_from_wire(wire_id), component_class_name, component_json)
 
         elif command == ClientCommands.SOUND:
             self.handle_play_sound(args[0], args[1])
@@ -42,12 +57,11 @@ class ClientActionHandler:
             hook(*args)
 
     def handle_create(self, entity_json: dict):
-        entity_id = entity_json['entity_id']
+        entity_id = entity_id_from_wire(entity_json['entity_id'])
         components = []
         for component_json in entity_json['components']:
             component_class_name = component_json.pop('component_class')
-            component_class = next(component_class for component_class in self.ecs._components if
-                                   component_class.__name__ == component_class_name)
+            component_class = self.ecs.get_component_class(component_class_name)
             component = component_class(**component_json)
             if hasattr(component, 'assemble_on_client'):
                 component.assemble_on_client(self.ecs)
@@ -62,12 +76,13 @@ class ClientActionHandler:
             setattr(self.current_player.resources, field, value)
 
     def handle_update_component_info(self, entity_id: EntityId, component_class_name: str, component_json):
-        component_class = next(component_class for component_class in self.ecs._components if
-                               component_class.__name__ == component_class_name)
+        if not self.ecs.has_entity(entity_id):
+            return
+        component_class = self.ecs.get_component_class(component_class_name)
         component = component_class(**component_json)
         if hasattr(component, 'assemble_on_client'):
             component.assemble_on_client(self.ecs)
-        self.ecs._components[component_class][entity_id] = component
+        self.ecs.add_component(entity_id, component)
 
     def handle_play_sound(self, sound_name: str, sound_position: tuple[float, float] | None):
         volume = 1
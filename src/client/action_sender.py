@@ -2,6 +2,7 @@ from typing import Iterable, Callable
 
 from src.constants import ServerCommands
 from src.core.types import EntityId
+from src.utils.unique_id import entity_id_to_wire
 
 
 class ClientActionSender:
@@ -9,10 +10,11 @@ class ClientActionSender:
         self.write_action_function = write_action_function
 
     def produce_unit(self, build_entity_id: EntityId, unit_name: str):
-        self.write_action_function([ServerCommands.PRODUCE_UNIT, build_entity_id, unit_name])
+        self.write_action_function([ServerCommands.PRODUCE_UNIT, entity_id_to_wire(build_entity_id), unit_name])
 
     def place_building(self, build_name: str, position: tuple[float, float]):
         self.write_action_function([ServerCommands.PLACE_UNIT, build_name, *position])
 
     def force_to_move(self, entities: Iterable[EntityId], position: tuple[float, float]):
-        self.write_action_function([ServerCommands.SET_TARGET_MOVE, list(entities), list(position)])
+        self.write_action_function([ServerCommands.SET_TARGET_MOVE,
+                                    [entity_id_to_wire(entity_id) for entity_id in entities], list(position)])
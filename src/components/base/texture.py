@@ -3,7 +3,7 @@ from dataclasses import dataclass
 import pygame
 from pygame.surface import Surface
 
-from src.utils.image import get_image
+from src.utils.image import get_image, get_rotated_image
 from src.utils.math_utils import convert_to_main_angle
 
 
@@ -23,10 +23,11 @@ class TextureComponent:
     def texture(self) -> pygame.Surface:
         return get_image(self.texture_path)
 
-    def blit(self, surface: Surface, position: tuple[float, float]):
-        texture = self.texture
-
-        rotated_image = pygame.transform.rotate(texture, self.rotation_angle)
-        new_rect = rotated_image.get_rect(center=position)
+    def blit_sequence_item(self, position: tuple[float, float]) -> tuple[Surface, tuple[float, float]]:
+        """Повёрнутая картинка и левый верхний угол для Surface.blits, чтобы центр попал в position"""
+        rotated_image = get_rotated_image(self.texture_path, self.rotation_angle)
+        return rotated_image, (position[0] - rotated_image.get_width() / 2,
+                               position[1] - rotated_image.get_height() / 2)
 
-        surface.blit(rotated_image, new_rect)
+    def blit(self, surface: Surface, position: tuple[float, float]):
+        surface.blit(*self.blit_sequence_item(position))
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from src.components.base.position import PositionComponent
 from src.core.entity_component_system import EntityComponentSystem
 from src.core.types import EntityId
+from src.utils.unique_id import entity_id_from_wire
 
 
 @dataclass(slots=True)
@@ -12,11 +13,15 @@ class ChaseComponent:
     rotation_speed: int  # in degrees
     chase_position: PositionComponent | None = None
     entity_id: EntityId | None = None
+    path_goal: tuple[float, float] | None = None  # общая точка приказа группе, путь к ней ищет NavigationGrid
 
     def assemble_on_client(self, ecs: EntityComponentSystem):
+        if self.path_goal is not None:
+            self.path_goal = tuple(self.path_goal)
         if self.chase_position is None:
             return
-        if self.entity_id:
+        if self.entity_id is not None:
+            self.entity_id = entity_id_from_wire(self.entity_id)
             self.chase_position = ecs.get_component(self.entity_id, PositionComponent)
             return
         self.chase_position = PositionComponent(**self.chase_position)
@@ -24,3 +29,4 @@ class ChaseComponent:
     def drop_target(self):
         self.chase_position = None
         self.entity_id = None
+        self.path_goal = None
@@ -5,4 +5,5 @@ from dataclasses import dataclass
 class DamageOnContactComponent:
     damage: int
     die_on_contact: bool = True
-    check_delay: int = 0
+    repeat_delay: int = 10  # снаряд, который не исчезает при попадании, бьёт не чаще раза в столько тиков
+    current_delay: int = 0
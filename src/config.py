@@ -41,10 +41,12 @@ class WorldConfig(BaseModel):
     base_meat: int = 25
 
     show_debug_info: bool = False
+    columnar_positions: bool = False  # позиции и скорости в массивах numpy
 
 
 class ScreenConfig(BaseModel):
     size: tuple[int, int] = (0, 0)
+    prebake_rotations: bool = False  # повернуть спрайты юнитов заранее при старте боя, до 64 МБ памяти
 
     @property
     def width(self):
@@ -32,6 +32,9 @@ class ClientCommands:
     SOUND = 8
     VICTORY = 9
     DEFEAT = 10
+    CREATE_BATCH = 11
+    DEAD_BATCH = 12
+    COMPONENT_INFO_BATCH = 13
 
 
 class SoundCode(Enum):
@@ -0,0 +1,71 @@
+from typing import Type, Iterable, Iterator
+
+from src.core.types import EntityId, Component
+
+
+class Archetype:
+    """
+    Таблица сущностей с одинаковым набором компонентов.
+    Компоненты хранятся колонками: i-я строка каждой колонки принадлежит сущности entity_ids[i]
+    """
+
+    def __init__(self, signature: frozenset[Type[Component]]):
+        self.signature = signature
+        self.entity_ids: list[EntityId] = []
+        self.columns: dict[Type[Component], list[Component]] = {component_class: [] for component_class in signature}
+        self._rows: dict[EntityId, int] = {}
+
+    def __len__(self):
+        return len(self.entity_ids)
+
+    def __contains__(self, entity_id: EntityId):
+        return entity_id in self._rows
+
+    def matches(self, component_classes: Iterable[Type[Component]]) -> bool:
+        return self.signature.issuperset(component_classes)
+
+    def add(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._rows[entity_id] = len(self.entity_ids)
+        self.entity_ids.append(entity_id)
+        for component_class, column in self.columns.items():
+            column.append(components[component_class])
+
+    def remove(self, entity_id: EntityId) -> dict[Type[Component], Component]:
+        """Удаляет сущность, переставляя на её место последнюю строку. Возвращает компоненты удалённой сущности"""
+        row = self._rows.pop(entity_id)
+        last_row = len(self.entity_ids) - 1
+
+        components = {}
+        for component_class, column in self.columns.items():
+            components[component_class] = column[row]
+            column[row] = column[last_row]
+            column.pop()
+
+        last_entity_id = self.entity_ids.pop()
+        if row != last_row:
+            self.entity_ids[row] = last_entity_id
+            self._rows[last_entity_id] = row
+
+        return components
+
+    def get(self, entity_id: EntityId, component_class: Type[Component]) -> Component:
+        return self.columns[component_class][self._rows[entity_id]]
+
+    def set(self, entity_id: EntityId, component_class: Type[Component], component: Component) -> None:
+        self.columns[component_class][self._rows[entity_id]] = component
+
+    def get_components(self, entity_id: EntityId) -> dict[Type[Component], Component]:
+        row = self._rows[entity_id]
+        return {component_class: column[row] for component_class, column in self.columns.items()}
+
+    def copy_columns(self, component_classes: tuple[Type[Component], ...]) -> \
+            tuple[list[EntityId], list[list[Component]]]:
+        """Копии колонок, поэтому структурные изменения во время обхода им не мешают"""
+        return self.entity_ids.copy(), [self.columns[component_class].copy() for component_class in component_classes]
+
+    def iterate(self, component_classes: tuple[Type[Component], ...]) -> Iterator[tuple[EntityId, tuple]]:
+        entity_ids, columns = self.copy_columns(component_classes)
+        if not columns:
+            return ((entity_id, ()) for entity_id in entity_ids)
+
+        return zip(entity_ids, zip(*columns))
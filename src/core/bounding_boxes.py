@@ -0,0 +1,62 @@
+import math
+from typing import Type
+
+import pygame
+
+from src.components.base.position import PositionComponent
+from src.components.base.texture import TextureComponent
+from src.core.entity_component_system import EntityComponentSystem
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component
+
+
+class BoundingBoxes(EntityIndex):
+    """
+    Прямоугольники текстур без учёта поворота, как texture.get_rect().
+    Размер берётся из картинки только при появлении или замене TextureComponent, центр ставится при запросе
+    """
+
+    def __init__(self):
+        self._rects: dict[EntityId, pygame.Rect] = {}
+        self.max_half_diagonal = 0.0  # только растёт, для поиска соседей по радиусу
+
+    def get(self, entity_id: EntityId, position: PositionComponent) -> pygame.Rect | None:
+        """Возвращается общий для сущности прямоугольник, он действителен до следующего запроса"""
+        rect = self._rects.get(entity_id)
+        if rect is not None:
+            rect.center = position.to_tuple()
+        return rect
+
+    def half_diagonal(self, entity_id: EntityId) -> float:
+        rect = self._rects.get(entity_id)
+        return 0.0 if rect is None else math.hypot(rect.width, rect.height) / 2
+
+    def _set(self, entity_id: EntityId, texture: TextureComponent) -> None:
+        rect = self._rects[entity_id] = texture.texture.get_rect()
+        self.max_half_diagonal = max(self.max_half_diagonal, math.hypot(rect.width, rect.height) / 2)
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        texture = components.get(TextureComponent)
+        if texture is not None:
+            self._set(entity_id, texture)
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._rects.pop(entity_id, None)
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        if isinstance(component, TextureComponent):
+            self._set(entity_id, component)
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        if component_class is TextureComponent:
+            self._rects.pop(entity_id, None)
+
+
+def init_bounding_boxes(ecs: EntityComponentSystem) -> BoundingBoxes:
+    """
+    Один индекс на ECS в переменной bounding_boxes: его читают и отрисовка, и damage_on_contact.
+    Подключается при первом вызове, дальше возвращается уже подключённый
+    """
+    if not ecs.has_variable('bounding_boxes'):
+        ecs.add_variable('bounding_boxes', ecs.add_index(BoundingBoxes()))
+    return ecs.get_variable('bounding_boxes')
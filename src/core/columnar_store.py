@@ -0,0 +1,207 @@
+import numpy as np
+
+from src.components.base.position import PositionComponent
+from src.components.base.velocity import VelocityComponent
+from src.core.types import EntityId, Component, VIEW_COMPONENT_CLASSES, component_class_of
+
+
+class _DetachedStore:
+    """Хранит последнее значение представления, сущность которого уже удалена из хранилища"""
+
+    def __init__(self, position: np.ndarray, velocity: np.ndarray):
+        self.position = position.reshape(1, 2).copy()
+        self.velocity = velocity.reshape(1, 2).copy()
+
+
+class PositionView(PositionComponent):
+    """PositionComponent, значения которого лежат в массивах ColumnarStore"""
+    __slots__ = ('_store', '_slot')
+
+    def __init__(self, store: 'ColumnarStore | _DetachedStore', slot: int):
+        self._store = store
+        self._slot = slot
+
+    @property
+    def x(self) -> float:
+        return float(self._store.position[self._slot, 0])
+
+    @x.setter
+    def x(self, value: float):
+        self._store.position[self._slot, 0] = value
+
+    @property
+    def y(self) -> float:
+        return float(self._store.position[self._slot, 1])
+
+    @y.setter
+    def y(self, value: float):
+        self._store.position[self._slot, 1] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, PositionComponent):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+
+class VelocityView(VelocityComponent):
+    """VelocityComponent, значения которого лежат в массивах ColumnarStore"""
+    __slots__ = ('_store', '_slot')
+
+    def __init__(self, store: 'ColumnarStore | _DetachedStore', slot: int):
+        self._store = store
+        self._slot = slot
+
+    @property
+    def speed_x(self) -> float:
+        return float(self._store.velocity[self._slot, 0])
+
+    @speed_x.setter
+    def speed_x(self, value: float):
+        self._store.velocity[self._slot, 0] = value
+
+    @property
+    def speed_y(self) -> float:
+        return float(self._store.velocity[self._slot, 1])
+
+    @speed_y.setter
+    def speed_y(self, value: float):
+        self._store.velocity[self._slot, 1] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, VelocityComponent):
+            return NotImplemented
+        return (self.speed_x, self.speed_y) == (other.speed_x, other.speed_y)
+
+
+VIEW_COMPONENT_CLASSES[PositionView] = PositionComponent
+VIEW_COMPONENT_CLASSES[VelocityView] = VelocityComponent
+
+
+class ColumnarStore:
+    """
+    Позиции и скорости всех сущностей в двух непрерывных массивах формы (N, 2).
+    Сущность без скорости хранит нулевую скорость, поэтому интегрирование - одна операция над массивом.
+    Удаление переставляет последнюю строку на место удалённой и исправляет индекс у её представлений
+    """
+    COMPONENT_CLASSES = (PositionComponent, VelocityComponent)
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.entity_ids: list[EntityId] = []
+        self._slots: dict[EntityId, int] = {}
+        self._views: list[dict[type, PositionView | VelocityView]] = []
+
+    def _allocate(self, entity_id: EntityId) -> int:
+        slot = self._slots.get(entity_id)
+        if slot is not None:
+            return slot
+
+        if self.size == len(self.position):
+            self.position = np.concatenate((self.position, np.zeros_like(self.position)))
+            self.velocity = np.concatenate((self.velocity, np.zeros_like(self.velocity)))
+
+        slot = self.size
+        self.size += 1
+        self.position[slot] = 0
+        self.velocity[slot] = 0
+        self.entity_ids.append(entity_id)
+        self._views.append({})
+        self._slots[entity_id] = slot
+        return slot
+
+    def _free(self, entity_id: EntityId) -> None:
+        slot = self._slots.pop(entity_id)
+        last_slot = self.size - 1
+        self.size -= 1
+
+        last_entity_id = self.entity_ids.pop()
+        last_views = self._views.pop()
+        if slot == last_slot:
+            return
+
+        self.position[slot] = self.position[last_slot]
+        self.velocity[slot] = self.velocity[last_slot]
+        self.entity_ids[slot] = last_entity_id
+        self._views[slot] = last_views
+        self._slots[last_entity_id] = slot
+        for view in last_views.values():
+            view._slot = slot
+
+    def adopt(self, entity_id: EntityId, component: Component) -> PositionView | VelocityView:
+        """Копирует значения компонента в массивы и возвращает представление, которое будет храниться в ECS"""
+        slot = self._allocate(entity_id)
+        views = self._views[slot]
+        if isinstance(component, PositionComponent):
+            self.position[slot] = component.x, component.y
+            view_class, component_class = PositionView, PositionComponent
+        else:
+            self.velocity[slot] = component.speed_x, component.speed_y
+            view_class, component_class = VelocityView, VelocityComponent
+
+        view = views.get(component_class)
+        if view is None:
+            view = views[component_class] = view_class(self, slot)
+        return view
+
+    def release(self, entity_id: EntityId, component_class: type) -> None:
+        slot = self._slots.get(entity_id)
+        if slot is None:
+            return
+
+        views = self._views[slot]
+        view = views.pop(component_class, None)
+        if view is not None:
+            view._store = _DetachedStore(self.position[slot], self.velocity[slot])
+            view._slot = 0
+        if component_class is VelocityComponent:
+            self.velocity[slot] = 0
+
+        if not views:
+            self._free(entity_id)
+
+    def release_entity(self, entity_id: EntityId) -> None:
+        for component_class in self.COMPONENT_CLASSES:
+            self.release(entity_id, component_class)
+
+    def integrate_velocities(self) -> None:
+        self.position[:self.size] += self.velocity[:self.size]
+
+
+def test():
+    from src.core.entity_component_system import EntityComponentSystem
+    from src.systems.base.velocity import columnar_velocity_system
+
+    ecs = EntityComponentSystem(columnar=True)
+    ecs.init_component(PositionComponent)
+    ecs.init_component(VelocityComponent)
+    ecs.init_batch_system(columnar_velocity_system)
+
+    arrow = ecs.create_entity([PositionComponent(0, 0), VelocityComponent(1, 2)])
+    tree = ecs.create_entity([PositionComponent(10, 10)])
+    ecs.update()
+    ecs.update()
+
+    arrow_position = ecs.get_component(arrow, PositionComponent)
+    assert isinstance(arrow_position, PositionComponent)
+    assert arrow_position.to_tuple() == (2, 4)
+    assert ecs.get_component(tree, PositionComponent) == PositionComponent(10, 10)
+
+    ecs.remove_entity(arrow)
+    assert arrow_position.to_tuple() == (2, 4)
+    tree_position = ecs.get_component(tree, PositionComponent)
+    tree_position.x += 5
+    assert ecs.columnar_store.position[0].tolist() == [15, 10]
+
+    # представление отмечается и уходит клиентам под зарегистрированным классом
+    changes = []
+    ecs.on_change = changes.extend
+    ecs.mark_changed(tree, tree_position)
+    ecs.sync_changes()
+    assert [(entity_id, component_class_of(component)) for entity_id, component in changes] == \
+           [(tree, PositionComponent)]
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,41 @@
+from typing import Any, Type
+
+from src.core.types import EntityId, Component, CommandType
+
+
+class CommandBuffer:
+    """
+    Создания, удаления и изменения набора компонентов, накопленные во время ECS.update.
+    Применяются одним проходом в порядке поступления, повторное удаление одной сущности отбрасывается
+    """
+
+    def __init__(self):
+        self.commands: list[tuple[CommandType, EntityId, Any]] = []
+        self._removed: set[EntityId] = set()
+
+    def __bool__(self):
+        return bool(self.commands)
+
+    def create_entity(self, entity_id: EntityId, components: list[Component]) -> None:
+        self.commands.append((CommandType.CREATE_ENTITY, entity_id, components))
+
+    def remove_entity(self, entity_id: EntityId) -> None:
+        if entity_id in self._removed:
+            return
+        self._removed.add(entity_id)
+        self.commands.append((CommandType.REMOVE_ENTITY, entity_id, None))
+
+    def add_component(self, entity_id: EntityId, component: Component) -> None:
+        self.commands.append((CommandType.ADD_COMPONENT, entity_id, component))
+
+    def remove_component(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        self.commands.append((CommandType.REMOVE_COMPONENT, entity_id, component_class))
+
+    def is_removed(self, entity_id: EntityId) -> bool:
+        return entity_id in self._removed
+
+    def drain(self) -> list[tuple[CommandType, EntityId, Any]]:
+        commands = self.commands
+        self.commands = []
+        self._removed = set()
+        return commands
@@ -1,48 +1,219 @@
 import inspect
 import time
-from typing import Callable, Type, Any, Iterator
-
-from src.core.types import EntityId, Component, StoredSystem
+from itertools import repeat
+from typing import Callable, Type, Any, Iterator, Iterable, get_args
+
+from src.core.archetype import Archetype
+from src.core.command_buffer import CommandBuffer
+from src.core.indexes import EntityIndex, RelationIndex, PartitionIndex
+from src.core.profiler import SystemProfiler
+from src.core.query import Query, QueryStats
+from src.core.types import EntityId, Component, StoredSystem, ArgumentSource, CallPlan, CommandType
+from src.core.types import component_class_of
 from src.systems.test import test_bc_system
-from src.utils.unique_id import UniqueIdGenerator
+from src.utils.unique_id import EntityIdAllocator
 
 
 class EntityComponentSystem:
     SPECIAL_ARGUMENTS = ('entity_id', 'ecs')
 
     def __init__(self, on_create: Callable[[EntityId, list[Component]], None] = None,
-                 on_remove: Callable[[EntityId], None] = None):
+                 on_remove: Callable[[EntityId], None] = None,
+                 use_dispatch_plans: bool = True,
+                 columnar: bool = False,
+                 on_sync: Callable[[list[tuple[EntityId, list[Component]]], list[EntityId]], None] = None,
+                 on_change: Callable[[list[tuple[EntityId, Component]]], None] = None,
+                 on_remove_requested: Callable[[EntityId], None] = None):
         self.systems: dict[Callable, StoredSystem] = {}
-        self._components: dict[Type[Component], dict[EntityId, Component]] = {}
-        self._entities: list[EntityId] = []
+        self._component_classes: dict[str, Type[Component]] = {}
+        self._archetypes: dict[frozenset[Type[Component]], Archetype] = {}
+        self._entity_archetypes: dict[EntityId, Archetype] = {}
+        self._queries: dict[tuple[Type[Component], ...], Query] = {}
+        self.query_stats = QueryStats()
+        self.profiler = SystemProfiler()
+        self._id_allocator = EntityIdAllocator()
         self._vars = {}
         self.on_create = on_create
         self.on_remove = on_remove
-
-    def _unsafe_get_component(self, entity_id: str, component_class: Type[Component]) -> Component:
-        return self._components[component_class][entity_id]
+        self.on_sync = on_sync  # одно уведомление о всех созданных и удалённых сущностях, для сети
+        self.on_change = on_change  # раз в тик получает компоненты, отмеченные через mark_changed
+        # сразу при вызове remove_entity: отмеченные в нём изменения уходят в on_change того же тика, до on_sync
+        self.on_remove_requested = on_remove_requested
+        self._changed: dict[Type[Component], set[EntityId]] = {}
+        self._indexes: list[EntityIndex] = []
+        self._relations: dict[tuple[Type[Component], str], RelationIndex] = {}
+        self._partitions: dict[tuple[Type[Component], str], PartitionIndex] = {}
+        self._spatial_hashes: dict[frozenset[Type[Component]], 'SpatialHash'] = {}
+        self._command_buffer = CommandBuffer()
+        self._deferring = False  # во время update структурные изменения откладываются до flush
+        self._tick = 0
+        self.use_dispatch_plans = use_dispatch_plans  # False - старый вызов по именам, оставлен для сравнения
+
+        self.columnar_store = None
+        if columnar:
+            from src.core.columnar_store import ColumnarStore
+            self.columnar_store = ColumnarStore()
+            self.add_variable('columnar_store', self.columnar_store)
+
+    def _unsafe_get_component(self, entity_id: EntityId, component_class: Type[Component]) -> Component:
+        return self._entity_archetypes[entity_id].get(entity_id, component_class)
+
+    def _get_archetype(self, signature: frozenset[Type[Component]]) -> Archetype:
+        archetype = self._archetypes.get(signature)
+        if archetype is not None:
+            return archetype
+
+        archetype = Archetype(signature)
+        self._archetypes[signature] = archetype
+        for query in self._queries.values():
+            if query.matches(archetype):
+                query.archetypes.append(archetype)
+                self.query_stats.archetype_updates += 1
+        return archetype
+
+    def _matching_archetypes(self, component_classes: Iterable[Type[Component]]) -> list[Archetype]:
+        return [archetype for archetype in self._archetypes.values() if archetype.matches(component_classes)]
+
+    def query(self, component_classes: Iterable[Type[Component]]) -> Query:
+        """Возвращает сохранённый запрос, создавая его при первом обращении"""
+        component_classes = tuple(component_classes)
+        query = self._queries.get(component_classes)
+        if query is not None:
+            self.query_stats.hits += 1
+            return query
+
+        self.query_stats.builds += 1
+        query = Query(component_classes, self._matching_archetypes(component_classes))
+        self._queries[component_classes] = query
+        return query
+
+    def get_query_stats(self) -> dict[str, float]:
+        return self.query_stats.as_dict()
 
     def init_component(self, component_class: Type[Component]) -> None:
-        self._components[component_class] = {}
+        self._component_classes[component_class.__name__] = component_class
+        self._changed[component_class] = set()
+
+    def mark_changed(self, entity_id: EntityId, component: Component) -> None:
+        """Компонент сущности изменён в этом тике, в конце тика его получит on_change, сколько бы раз его ни отметили"""
+        self._changed[component_class_of(component)].add(entity_id)
+        for index in self._indexes:
+            index.on_component_changed(entity_id, component)
+
+    def get_changed(self, component_class: Type[Component]) -> set[EntityId]:
+        return self._changed[component_class]
+
+    def sync_changes(self) -> None:
+        """Передаёт on_change по одному экземпляру каждого изменённого компонента и очищает отметки"""
+        changes = []
+        for component_class, entity_ids in self._changed.items():
+            if not entity_ids:
+                continue
+
+            for entity_id in entity_ids:
+                archetype = self._entity_archetypes.get(entity_id)
+                if archetype is None or component_class not in archetype.signature \
+                        or self._command_buffer.is_removed(entity_id):
+                    continue
+                changes.append((entity_id, archetype.get(entity_id, component_class)))
+            entity_ids.clear()
+
+        if changes and self.on_change is not None:
+            self.on_change(changes)
+
+    def get_component_class(self, component_class_name: str) -> Type[Component]:
+        return self._component_classes[component_class_name]
+
+    def add_index(self, index: EntityIndex) -> EntityIndex:
+        """Подключает индекс и сразу передаёт ему уже существующие сущности"""
+        self._indexes.append(index)
+        for entity_id, archetype in self._entity_archetypes.items():
+            index.on_entity_created(entity_id, archetype.get_components(entity_id))
+        return index
+
+    def init_relation(self, component_class: Type[Component], field: str) -> RelationIndex:
+        """Начинает вести обратный индекс ссылок из поля field компонента component_class на другие сущности"""
+        relation = RelationIndex(component_class, field)
+        self._relations[(component_class, field)] = relation
+        self.add_index(relation)
+        return relation
+
+    def get_relation(self, component_class: Type[Component], field: str) -> RelationIndex:
+        return self._relations[(component_class, field)]
+
+    def init_partition(self, component_class: Type[Component], field: str) -> PartitionIndex:
+        """Начинает разбивать сущности по значению поля field компонента component_class, например по владельцу"""
+        partition = PartitionIndex(component_class, field)
+        self._partitions[(component_class, field)] = partition
+        self.add_index(partition)
+        return partition
+
+    def get_partition(self, component_class: Type[Component], field: str) -> PartitionIndex:
+        return self._partitions[(component_class, field)]
+
+    def init_spatial_hash(self, component_classes: Iterable[Type[Component]] = (),
+                          cell_size: float | None = None) -> 'SpatialHash':
+        """Начинает вести сетку по позициям сущностей, у которых есть ещё и все component_classes"""
+        from src.core.spatial_hash import SpatialHash
+
+        component_classes = frozenset(component_classes)
+        spatial_hash = SpatialHash(component_classes, cell_size or SpatialHash.DEFAULT_CELL_SIZE)
+        self._spatial_hashes[component_classes] = spatial_hash
+        self.add_index(spatial_hash)
+        return spatial_hash
+
+    def get_spatial_hash(self, component_classes: Iterable[Type[Component]] = ()) -> 'SpatialHash':
+        return self._spatial_hashes[frozenset(component_classes)]
+
+    def init_system(self, system: Callable, interval: int = 1, stagger: bool = False):
+        """
+        interval - система запускается раз в interval тиков.
+        stagger - вместо этого система запускается каждый тик, но для каждой interval-й строки архетипа,
+        так что каждая сущность обрабатывается примерно раз в interval тиков и нагрузка распределена по тикам
+        """
+        self.systems[system] = self._create_stored_system(system, False, interval, stagger)
+        self.profiler.add_system(system.__name__)
+
+    def init_batch_system(self, system: Callable, interval: int = 1, stagger: bool = False):
+        """
+        Система вызывается один раз за тик сразу со всеми подходящими сущностями:
+        entity_ids - список их id, параметры с аннотацией Sequence[Компонент] - выровненные с ним списки компонентов
+        """
+        stored_system = self._create_stored_system(system, True, interval, stagger)
+        if stored_system.call_plan is None:
+            raise Exception(f'Batch system {system.__name__} must have only positional arguments')
+        self.systems[system] = stored_system
+        self.profiler.add_system(system.__name__)
+
+    def _create_stored_system(self, system: Callable, batch: bool, interval: int = 1,
+                              stagger: bool = False) -> StoredSystem:
+        if interval < 1:
+            raise Exception(f'Wrong interval of {system.__name__}: {interval}')
 
-    def init_system(self, system: Callable):
         stored_system = StoredSystem(
             components={},
             variables={},
             has_entity_id_argument=False,
-            has_ecs_argument=False
+            has_ecs_argument=False,
+            batch=batch,
+            interval=interval,
+            stagger=stagger,
         )
+        entity_id_param = 'entity_ids' if batch else 'entity_id'
 
         system_params = inspect.signature(system).parameters
         for param_name, param in system_params.items():
-            if param_name == 'entity_id':
+            component_class = get_args(param.annotation)[0] if batch and get_args(param.annotation) \
+                else param.annotation
+
+            if param_name == entity_id_param:
                 stored_system.has_entity_id_argument = True
 
             elif param_name == 'ecs':
                 stored_system.has_ecs_argument = True
 
-            elif param.annotation in self._components:
-                stored_system.components[param_name] = param.annotation
+            elif component_class in self._component_classes.values():
+                stored_system.components[param_name] = component_class
 
             elif param_name in self._vars:
                 stored_system.variables[param_name] = self._vars[param_name]
@@ -50,61 +221,321 @@ class EntityComponentSystem:
             else:
                 raise Exception(f'Wrong argument: {param_name}')
 
-        self.systems[system] = stored_system
+        stored_system.query = self.query(stored_system.components.values())
+        stored_system.call_plan = self._compile_call_plan(stored_system, system_params, entity_id_param)
+        return stored_system
+
+    @staticmethod
+    def _compile_call_plan(system: StoredSystem, system_params, entity_id_param: str) -> CallPlan | None:
+        component_indexes = {param_name: i for i, param_name in enumerate(system.components)}
+        call_plan = []
+        for param_name, param in system_params.items():
+            if param.kind not in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                return None
+
+            if param_name == entity_id_param:
+                call_plan.append((ArgumentSource.ENTITY_ID, None))
+            elif param_name == 'ecs':
+                call_plan.append((ArgumentSource.ECS, None))
+            elif param_name in component_indexes:
+                call_plan.append((ArgumentSource.COMPONENT, component_indexes[param_name]))
+            else:
+                call_plan.append((ArgumentSource.VARIABLE, system.variables[param_name]))
+        return tuple(call_plan)
 
     def add_variable(self, variable_name: str, variable_value: Any) -> None:
         self._vars[variable_name] = variable_value
 
+    def get_variable(self, variable_name: str) -> Any:
+        return self._vars[variable_name]
+
+    def has_variable(self, variable_name: str) -> bool:
+        return variable_name in self._vars
+
     def create_entity(self, components: list[Component], entity_id=None) -> EntityId:
+        """Во время update сущность появится только в конце тика, но id выдаётся сразу"""
         if entity_id is None:
-            entity_id = UniqueIdGenerator.generate_id()
+            entity_id = self._id_allocator.allocate()
         else:
-            assert entity_id not in self._entities, f"Entity with id {entity_id} already exists"
+            assert entity_id not in self._entity_archetypes, f"Entity with id {entity_id} already exists"
+            self._id_allocator.claim(entity_id)
 
-        for component in components:
-            self._components[component.__class__][entity_id] = component
-        self._entities.append(entity_id)
+        if self._deferring:
+            self._command_buffer.create_entity(entity_id, components)
+            return entity_id
+
+        self._apply_create_entity(entity_id, components)
+        self._notify_sync([(entity_id, components)], [])
+        return entity_id
+
+    def _apply_create_entity(self, entity_id: EntityId, components: list[Component]) -> None:
+        components_by_class = {component_class_of(component): component for component in components}
+        if self.columnar_store is not None:
+            for component_class in self.columnar_store.COMPONENT_CLASSES:
+                if component_class in components_by_class:
+                    components_by_class[component_class] = self.columnar_store.adopt(
+                        entity_id, components_by_class[component_class])
+
+        archetype = self._get_archetype(frozenset(components_by_class))
+        archetype.add(entity_id, components_by_class)
+        self._entity_archetypes[entity_id] = archetype
+        for index in self._indexes:
+            index.on_entity_created(entity_id, components_by_class)
 
         if self.on_create:
             self.on_create(entity_id, components)
 
-        return entity_id
+    def add_component(self, entity_id: EntityId, component: Component) -> None:
+        """
+        Добавляет компонент сущности или заменяет уже существующий компонент того же класса.
+        Замена применяется сразу, а добавление во время update откладывается до конца тика
+        """
+        archetype = self._entity_archetypes.get(entity_id)
+        if self._deferring and (archetype is None or component_class_of(component) not in archetype.signature):
+            self._command_buffer.add_component(entity_id, component)
+            return
+
+        self._apply_add_component(entity_id, component)
+
+    def _apply_add_component(self, entity_id: EntityId, component: Component) -> None:
+        archetype = self._entity_archetypes[entity_id]
+        component_class = component_class_of(component)
+        self._changed[component_class].add(entity_id)
+        if self.columnar_store is not None and component_class in self.columnar_store.COMPONENT_CLASSES:
+            component = self.columnar_store.adopt(entity_id, component)
+
+        if component_class in archetype.signature:
+            archetype.set(entity_id, component_class, component)
+        else:
+            components = archetype.remove(entity_id)
+            components[component_class] = component
+            self._move_entity(entity_id, components)
+
+        for index in self._indexes:
+            index.on_component_changed(entity_id, component)
+
+    def remove_component(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        if self._deferring:
+            self._command_buffer.remove_component(entity_id, component_class)
+            return
+
+        self._apply_remove_component(entity_id, component_class)
+
+    def _apply_remove_component(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        archetype = self._entity_archetypes[entity_id]
+        if component_class not in archetype.signature:
+            return
+
+        if self.columnar_store is not None:
+            self.columnar_store.release(entity_id, component_class)
+
+        components = archetype.remove(entity_id)
+        del components[component_class]
+        self._move_entity(entity_id, components)
+        for index in self._indexes:
+            index.on_component_removed(entity_id, component_class)
+
+    def _move_entity(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        archetype = self._get_archetype(frozenset(components))
+        archetype.add(entity_id, components)
+        self._entity_archetypes[entity_id] = archetype
+
+    def flush(self) -> None:
+        """Применяет отложенные структурные изменения и одним вызовом сообщает on_sync о созданных и удалённых"""
+        created = []
+        removed = []
+        for command, entity_id, payload in self._command_buffer.drain():
+            if command == CommandType.CREATE_ENTITY:
+                self._apply_create_entity(entity_id, payload)
+                created.append((entity_id, payload))
+                continue
+
+            if entity_id not in self._entity_archetypes:
+                continue  # сущность уже удалена
+
+            if command == CommandType.REMOVE_ENTITY:
+                self._apply_remove_entity(entity_id)
+                removed.append(entity_id)
+            elif command == CommandType.ADD_COMPONENT:
+                self._apply_add_component(entity_id, payload)
+            else:
+                self._apply_remove_component(entity_id, payload)
+
+        if created or removed:
+            self._notify_sync(created, removed)
+
+    def _notify_sync(self, created: list[tuple[EntityId, list[Component]]], removed: list[EntityId]) -> None:
+        if self.on_sync is not None:
+            self.on_sync(created, removed)
 
     def get_entity_ids_with_components(self, component_classes: tuple[Type[Component], ...]) -> set[EntityId]:
         if not component_classes:
-            return set(self._entities)
+            return set(self._entity_archetypes)
 
-        entities = set.intersection(
-            *[set(self._components[component_class]) for component_class in component_classes])
-        return entities
+        return self.query(component_classes).entity_ids()
 
     def get_entities_with_components(self, component_classes: list[Type[Component]]) -> \
             Iterator[tuple[EntityId, list[Component]]]:
-        for entity_id in self.get_entity_ids_with_components(component_classes):
-            components = tuple(self._components[component_class][entity_id] for component_class in component_classes)
-            yield entity_id, components
+        return iter(self.query(component_classes))
 
     def update(self) -> None:
-        for system_function, system in self.systems.items():
-            for entity_id in self.get_entity_ids_with_components(list(system.components.values())):
-                special_args = {}
-                if system.has_ecs_argument:
-                    special_args['ecs'] = self
+        self._invalidate_indexes()
+        self._deferring = True
+        try:
+            for system_function, system in self.systems.items():
+                self._run_system(system_function, system)
+        finally:
+            self._deferring = False
+        self._invalidate_indexes()
+        self._tick += 1
+        self.sync_changes()  # до flush: удаляемые в этом тике сущности не синхронизируются
+        self.flush()
+
+    def _invalidate_indexes(self) -> None:
+        for index in self._indexes:
+            index.invalidate()
+
+    def _run_system(self, system_function: Callable, system: StoredSystem) -> None:
+        phase = self._tick % system.interval
+        if phase and not system.stagger:
+            self.profiler.record(system_function.__name__, 0.0, 0, 0)
+            return
+
+        rows = slice(phase, None, system.interval) if system.stagger else None
+        start = time.perf_counter()
+        if system.batch:
+            entities, calls = self._run_batch_system(system_function, system, rows)
+        elif self.use_dispatch_plans and system.call_plan is not None:
+            entities, calls = self._run_system_with_call_plan(system_function, system, rows)
+        else:
+            entities, calls = self._run_system_with_kwargs(system_function, system, rows)
+        self.profiler.record(system_function.__name__, time.perf_counter() - start, entities, calls)
+
+    def get_system_stats(self) -> dict[str, dict[str, float]]:
+        """Среднее и максимальное время в мс, сущностей и вызовов за тик для каждой системы"""
+        return self.profiler.as_dict()
+
+    def _run_system_with_call_plan(self, system_function: Callable, system: StoredSystem,
+                                   rows: slice | None = None) -> tuple[int, int]:
+        """Возвращает число обработанных сущностей и вызовов системы"""
+        calls = 0
+        # структурные изменения отложены до flush, поэтому колонки обходятся без копирования
+        for archetype in system.query.archetypes:
+            if not archetype:
+                continue
+
+            entity_ids = archetype.entity_ids
+            columns = [archetype.columns[component_class] for component_class in system.query.component_classes]
+            if rows is not None:
+                entity_ids = entity_ids[rows]
+                columns = [column[rows] for column in columns]
+
+            arguments = []
+            for source, value in system.call_plan:
+                if source == ArgumentSource.COMPONENT:
+                    arguments.append(columns[value])
+                elif source == ArgumentSource.ENTITY_ID:
+                    arguments.append(entity_ids)
+                elif source == ArgumentSource.ECS:
+                    arguments.append(repeat(self))
+                else:
+                    arguments.append(repeat(value))
+
+            calls += len(entity_ids)
+            if not arguments:
+                for _ in entity_ids:
+                    system_function()
+                continue
+
+            for args in zip(*arguments):
+                system_function(*args)
+        return calls, calls
+
+    def _run_batch_system(self, system_function: Callable, system: StoredSystem,
+                          rows: slice | None = None) -> tuple[int, int]:
+        component_classes = system.query.component_classes
+        entity_ids = []
+        columns = [[] for _ in component_classes]
+        if component_classes or system.has_entity_id_argument:
+            for archetype in system.query.archetypes:
+                entity_ids += archetype.entity_ids
+                for column, component_class in zip(columns, component_classes):
+                    column += archetype.columns[component_class]
+
+            if rows is not None:
+                entity_ids = entity_ids[rows]
+                columns = [column[rows] for column in columns]
+
+            if component_classes and not entity_ids:
+                return 0, 0
+
+        arguments = []
+        for source, value in system.call_plan:
+            if source == ArgumentSource.COMPONENT:
+                arguments.append(columns[value])
+            elif source == ArgumentSource.ENTITY_ID:
+                arguments.append(entity_ids)
+            elif source == ArgumentSource.ECS:
+                arguments.append(self)
+            else:
+                arguments.append(value)
+        system_function(*arguments)
+        return len(entity_ids), 1
+
+    def _run_system_with_kwargs(self, system_function: Callable, system: StoredSystem,
+                                rows: slice | None = None) -> tuple[int, int]:
+        calls = 0
+        special_args = {}
+        if system.has_ecs_argument:
+            special_args['ecs'] = self
+
+        for archetype in system.query.archetypes:
+            entity_ids, columns = archetype.copy_columns(system.query.component_classes)
+            if rows is not None:
+                entity_ids = entity_ids[rows]
+                columns = [column[rows] for column in columns]
+
+            calls += len(entity_ids)
+            for entity_id, *components in zip(entity_ids, *columns):
                 if system.has_entity_id_argument:
                     special_args['entity_id'] = entity_id
                 system_function(
-                    **{param: self._unsafe_get_component(entity_id, component_name) for param, component_name in
-                       system.components.items()} | system.variables | special_args)
+                    **dict(zip(system.components, components)) | system.variables | special_args)
+        return calls, calls
 
     def remove_entity(self, entity_id: EntityId):
+        """Во время update сущность удаляется в конце тика, повторные удаления за тик игнорируются"""
+        if self._deferring:
+            if self._command_buffer.is_removed(entity_id):
+                return
+            self._command_buffer.remove_entity(entity_id)
+            if self.on_remove_requested is not None:
+                self.on_remove_requested(entity_id)
+            return
+
+        if self.on_remove_requested is not None:
+            self.on_remove_requested(entity_id)
+        self._apply_remove_entity(entity_id)
+        self._notify_sync([], [entity_id])
+
+    def _apply_remove_entity(self, entity_id: EntityId) -> None:
         if self.on_remove is not None:
             self.on_remove(entity_id)
-        for components in self._components.values():
-            components.pop(entity_id, None)
-        self._entities.remove(entity_id)
+        components = self._entity_archetypes.pop(entity_id).remove(entity_id)
+        for index in self._indexes:
+            index.on_entity_removed(entity_id, components)
+        self._id_allocator.release(entity_id)
+        if self.columnar_store is not None:
+            self.columnar_store.release_entity(entity_id)
+
+    def has_entity(self, entity_id: EntityId) -> bool:
+        return entity_id in self._entity_archetypes
 
     def get_component(self, entity_id: EntityId, component_class: Type[Component]):
-        return self._components[component_class].get(entity_id, None)
+        archetype = self._entity_archetypes.get(entity_id)
+        if archetype is None or component_class not in archetype.signature:
+            return None
+        return archetype.get(entity_id, component_class)
 
     def get_components(self, entity_id: EntityId,
                        component_classes):
@@ -116,8 +547,9 @@ class EntityComponentSystem:
 
 
 def test():
+    from src.components.chase import ChaseComponent
     from src.components.test import BComponent, CComponent
-    from src.systems.test import test_a_system, test_b_system
+    from src.systems.test import test_a_system, test_b_system, test_b_batch_system
 
     ecs = EntityComponentSystem()
     ecs.add_variable('a', 150)
@@ -128,18 +560,157 @@ def test():
     ecs.init_system(test_a_system)
     ecs.init_system(test_b_system)
     ecs.init_system(test_bc_system)
+    ecs.init_batch_system(test_b_batch_system)
+
+    first = ecs.create_entity([])
+    second = ecs.create_entity([])
+    b = ecs.create_entity([BComponent(value=42)])
+    bc = ecs.create_entity([BComponent(value=42), CComponent(value=69)])
+
+    ecs.update()
+
+    assert sorted(ecs.get_entities_with_components((BComponent,))) == [(b, (BComponent(value=42),)),
+                                                                       (bc, (BComponent(value=42),))]
+    assert next(ecs.get_entities_with_components((BComponent, CComponent))) == (bc, (BComponent(value=42), CComponent(value=69)))
+
+    ecs.add_component(b, CComponent(value=7))
+    assert ecs.get_components(b, (BComponent, CComponent)) == (BComponent(value=42), CComponent(value=7))
+    assert ecs.get_entity_ids_with_components((BComponent, CComponent)) == {b, bc}
+
+    ecs.remove_component(bc, CComponent)
+    assert ecs.get_component(bc, CComponent) is None
+    assert ecs.get_entity_ids_with_components((CComponent,)) == {b}
+
+    ecs.remove_entity(b)
+    assert not ecs.has_entity(b)
+    assert ecs.get_entity_ids_with_components((BComponent,)) == {bc}
+    assert ecs.get_entity_ids_with_components(()) == {first, second, bc}
+
+    reused = ecs.create_entity([])
+    assert reused != b and not ecs.has_entity(b)
+
+    ecs.query_stats.reset()
+    ecs.get_entity_ids_with_components((BComponent,))
+    ecs.create_entity([CComponent(value=1), BComponent(value=1)])
+    ecs.get_entity_ids_with_components((BComponent,))
+    assert ecs.get_query_stats()['hits'] == 2
+    assert ecs.get_query_stats()['builds'] == 0
+    system_stats = ecs.get_system_stats()
+    assert system_stats['test_b_batch_system']['calls'] == 1
+    assert system_stats['test_b_batch_system']['entities'] == 2
+    assert system_stats['test_bc_system']['calls'] == 1
+
+    synced = []
+    ecs = EntityComponentSystem(on_sync=lambda created, removed: synced.append((created, removed)))
+    ecs.init_component(BComponent)
+
+    def split_system(entity_id: EntityId, b: BComponent, ecs: EntityComponentSystem):
+        ecs.remove_entity(entity_id)
+        ecs.remove_entity(entity_id)
+        ecs.create_entity([BComponent(value=b.value + 1)])
+        assert ecs.has_entity(entity_id)
+
+    ecs.init_system(split_system)
+    parent = ecs.create_entity([BComponent(value=1)])
+    synced.clear()
+    ecs.update()
+
+    assert not ecs.has_entity(parent)
+    assert len(synced) == 1
+    [(child, _)], removed = synced[0]
+    assert removed == [parent]
+    assert ecs.get_component(child, BComponent) == BComponent(value=2)
+
+    changes = []
+    ecs = EntityComponentSystem(on_change=changes.extend)
+    ecs.init_component(BComponent)
+    ecs.init_component(CComponent)
+    changed = ecs.create_entity([BComponent(value=1), CComponent(value=1)])
+    removed = ecs.create_entity([BComponent(value=1)])
+
+    def change_system(entity_id: EntityId, b: BComponent, ecs: EntityComponentSystem):
+        b.value += 1
+        ecs.mark_changed(entity_id, b)
+        ecs.mark_changed(entity_id, b)
+        if entity_id == removed:
+            ecs.remove_entity(entity_id)
+
+    ecs.init_system(change_system)
+    ecs.update()
+    assert changes == [(changed, BComponent(value=2))]
+    assert not ecs.get_changed(BComponent)
+
+    changes.clear()
+    requested = []
 
-    ecs.create_entity([])
-    ecs.create_entity([])
-    ecs.create_entity([BComponent(value=42)])
-    ecs.create_entity([BComponent(value=42), CComponent(value=69)])
+    def on_remove_requested(entity_id: EntityId):
+        requested.append(entity_id)
+        ecs.mark_changed(changed, ecs.get_component(changed, CComponent))
 
+    ecs.on_remove_requested = on_remove_requested
+    removed = ecs.create_entity([BComponent(value=1)])
     ecs.update()
+    assert requested == [removed]
+    assert (changed, CComponent(value=1)) in changes
+    assert not ecs.has_entity(removed)
 
-    assert sorted(ecs.get_entities_with_components((BComponent,))) == [('3', (BComponent(value=42),)),
-                                                                       ('4', (BComponent(value=42),))]
-    assert next(ecs.get_entities_with_components((BComponent, CComponent))) == ('4', (BComponent(value=42), CComponent(value=69)))
+    ecs = EntityComponentSystem()
+    ecs.init_component(ChaseComponent)
+    chasers = ecs.init_relation(ChaseComponent, 'entity_id')
+    target = ecs.create_entity([])
+    other_target = ecs.create_entity([])
+    chaser = ecs.create_entity([ChaseComponent(0, 0, 0, entity_id=target)])
+    switcher = ecs.create_entity([ChaseComponent(0, 0, 0, entity_id=target)])
+    assert {source_id for source_id, _ in chasers.sources(target)} == {chaser, switcher}
+
+    switcher_chase = ecs.get_component(switcher, ChaseComponent)
+    switcher_chase.entity_id = other_target
+    assert [source_id for source_id, _ in chasers.sources(target)] == [chaser]
+    ecs.mark_changed(switcher, switcher_chase)
+    assert [source_id for source_id, _ in chasers.sources(other_target)] == [switcher]
+
+    ecs.remove_entity(chaser)
+    assert chasers.sources(target) == []
 
+    ecs = EntityComponentSystem()
+    ecs.init_component(BComponent)
+    ecs.init_component(CComponent)
+    first_b = ecs.create_entity([BComponent(value=1), CComponent(value=0)])
+    owners = ecs.init_partition(CComponent, 'value')
+    second_b = ecs.create_entity([BComponent(value=2), CComponent(value=0)])
+    only_c = ecs.create_entity([CComponent(value=1)])
+    assert owners.entities_with(0, BComponent) == {first_b, second_b}
+    assert owners.entities(1) == {only_c}
+
+    ecs.remove_component(first_b, BComponent)
+    ecs.add_component(only_c, BComponent(value=3))
+    assert owners.entities_with(0, BComponent) == {second_b}
+    assert owners.entities_with(1, BComponent) == {only_c}
+
+    ecs.add_component(second_b, CComponent(value=1))
+    assert owners.entities_with(1, BComponent) == {only_c, second_b}
+    assert not owners.entities_with(0, BComponent)
+
+    ecs.remove_entity(only_c)
+    ecs.remove_component(second_b, CComponent)
+    assert not owners.entities_with(1, BComponent)
+    assert set(owners.keys()) == {0}
+
+    staggered_calls = []
+    rare_calls = []
+    ecs = EntityComponentSystem()
+    ecs.init_component(BComponent)
+    ecs.init_system(lambda entity_id: staggered_calls.append(entity_id), interval=3, stagger=True)
+    ecs.init_batch_system(lambda entity_ids: rare_calls.append(len(entity_ids)), interval=2)
+    entity_ids = [ecs.create_entity([BComponent(value=i)]) for i in range(7)]
+    for use_dispatch_plans in (True, False):
+        staggered_calls.clear()
+        rare_calls.clear()
+        ecs.use_dispatch_plans = use_dispatch_plans
+        for _ in range(6):
+            ecs.update()
+        assert sorted(staggered_calls) == sorted(entity_ids * 2)
+        assert rare_calls == [7, 7, 7]
 
 if __name__ == '__main__':
     test()
@@ -1,6 +1,14 @@
-from typing import Protocol, Type, TypeVar, overload, Callable, Any, Iterator
-
+from typing import Protocol, Type, TypeVar, overload, Callable, Any, Iterator, Iterable
+
+from src.core.archetype import Archetype
+from src.core.command_buffer import CommandBuffer
+from src.core.indexes import EntityIndex, RelationIndex, PartitionIndex
+from src.core.profiler import SystemProfiler
+from src.core.columnar_store import ColumnarStore
+from src.core.query import Query, QueryStats
+from src.core.spatial_hash import SpatialHash
 from src.core.types import EntityId, Component, StoredSystem
+from src.utils.unique_id import EntityIdAllocator
 
 Component1 = TypeVar('Component1')
 Component2 = TypeVar('Component2')
@@ -10,31 +18,110 @@ Component4 = TypeVar('Component4')
 
 class EntityComponentSystem(Protocol):
     systems: dict[Callable, StoredSystem]
-    _components: dict[Type[Component], dict[EntityId, Component]]
-    _entities: list[EntityId]
+    _component_classes: dict[str, Type[Component]]
+    _archetypes: dict[frozenset[Type[Component]], Archetype]
+    _entity_archetypes: dict[EntityId, Archetype]
+    _queries: dict[tuple[Type[Component], ...], Query]
+    query_stats: QueryStats
+    profiler: SystemProfiler
+    _id_allocator: EntityIdAllocator
 
     _vars: dict[str, Any]
+    use_dispatch_plans: bool
+    columnar_store: ColumnarStore | None
     on_create: Callable[[EntityId, list[Component]], None]
     on_remove: Callable[[EntityId], None]
+    on_sync: Callable[[list[tuple[EntityId, list[Component]]], list[EntityId]], None]
+    on_change: Callable[[list[tuple[EntityId, Component]]], None]
+    on_remove_requested: Callable[[EntityId], None]
+    _changed: dict[Type[Component], set[EntityId]]
+    _indexes: list[EntityIndex]
+    _relations: dict[tuple[Type[Component], str], RelationIndex]
+    _partitions: dict[tuple[Type[Component], str], PartitionIndex]
+    _spatial_hashes: dict[frozenset[Type[Component]], SpatialHash]
+    _command_buffer: CommandBuffer
+    _deferring: bool
+    _tick: int
 
     def __init__(self, on_create: Callable[[EntityId, list[Component]], None] = None,
-                 on_remove: Callable[[EntityId], None] = None): ...
+                 on_remove: Callable[[EntityId], None] = None,
+                 use_dispatch_plans: bool = True,
+                 columnar: bool = False,
+                 on_sync: Callable[[list[tuple[EntityId, list[Component]]], list[EntityId]], None] = None,
+                 on_change: Callable[[list[tuple[EntityId, Component]]], None] = None,
+                 on_remove_requested: Callable[[EntityId], None] = None): ...
 
     @overload
-    def _unsafe_get_component(self, entity_id: str, component_class: Type[Component1]) -> Component1: ...
+    def _unsafe_get_component(self, entity_id: EntityId, component_class: Type[Component1]) -> Component1: ...
 
     @overload
     def init_component(self, component_class: Type[Component1]) -> None: ...
 
+    def _get_archetype(self, signature: frozenset[Type[Component]]) -> Archetype: ...
+
+    def _matching_archetypes(self, component_classes: Iterable[Type[Component]]) -> list[Archetype]: ...
+
+    def query(self, component_classes: Iterable[Type[Component]]) -> Query: ...
+
+    def get_query_stats(self) -> dict[str, float]: ...
+
+    def get_component_class(self, component_class_name: str) -> Type[Component]: ...
+
+    def add_index(self, index: EntityIndex) -> EntityIndex: ...
+
+    def init_relation(self, component_class: Type[Component], field: str) -> RelationIndex: ...
+
+    def get_relation(self, component_class: Type[Component], field: str) -> RelationIndex: ...
+
+    def init_partition(self, component_class: Type[Component], field: str) -> PartitionIndex: ...
+
+    def get_partition(self, component_class: Type[Component], field: str) -> PartitionIndex: ...
+
+    def init_spatial_hash(self, component_classes: Iterable[Type[Component]] = (),
+                          cell_size: float | None = None) -> SpatialHash: ...
+
+    def get_spatial_hash(self, component_classes: Iterable[Type[Component]] = ()) -> SpatialHash: ...
+
+    def mark_changed(self, entity_id: EntityId, component: Component) -> None: ...
+
+    def get_changed(self, component_class: Type[Component]) -> set[EntityId]: ...
+
+    def sync_changes(self) -> None: ...
+
     @overload
-    def init_system(self, system: Callable): ...
+    def init_system(self, system: Callable, interval: int = 1, stagger: bool = False): ...
+
+    def init_batch_system(self, system: Callable, interval: int = 1, stagger: bool = False): ...
+
+    def _create_stored_system(self, system: Callable, batch: bool, interval: int = 1,
+                              stagger: bool = False) -> StoredSystem: ...
 
     @overload
     def add_variable(self, variable_name: str, variable_value: Any) -> None: ...
 
+    def get_variable(self, variable_name: str) -> Any: ...
+
+    def has_variable(self, variable_name: str) -> bool: ...
+
     @overload
     def create_entity(self, components: list[Component1], entity_id=None) -> EntityId: ...
 
+    def _apply_create_entity(self, entity_id: EntityId, components: list[Component]) -> None: ...
+
+    def add_component(self, entity_id: EntityId, component: Component1) -> None: ...
+
+    def _apply_add_component(self, entity_id: EntityId, component: Component) -> None: ...
+
+    def remove_component(self, entity_id: EntityId, component_class: Type[Component1]) -> None: ...
+
+    def _apply_remove_component(self, entity_id: EntityId, component_class: Type[Component]) -> None: ...
+
+    def _move_entity(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def _notify_sync(self, created: list[tuple[EntityId, list[Component]]], removed: list[EntityId]) -> None: ...
+
     @overload
     def get_entity_ids_with_components(self, component_classes: list[Type[Component1]]) -> set[EntityId]: ...
 
@@ -60,8 +147,27 @@ class EntityComponentSystem(Protocol):
 
     def update(self) -> None: ...
 
+    def _invalidate_indexes(self) -> None: ...
+
+    def _run_system(self, system_function: Callable, system: StoredSystem) -> None: ...
+
+    def get_system_stats(self) -> dict[str, dict[str, float]]: ...
+
+    def _run_system_with_call_plan(self, system_function: Callable, system: StoredSystem,
+                                   rows: slice | None = None) -> tuple[int, int]: ...
+
+    def _run_batch_system(self, system_function: Callable, system: StoredSystem,
+                          rows: slice | None = None) -> tuple[int, int]: ...
+
+    def _run_system_with_kwargs(self, system_function: Callable, system: StoredSystem,
+                                rows: slice | None = None) -> tuple[int, int]: ...
+
     def remove_entity(self, entity_id: EntityId): ...
 
+    def _apply_remove_entity(self, entity_id: EntityId) -> None: ...
+
+    def has_entity(self, entity_id: EntityId) -> bool: ...
+
     def get_component(self, entity_id: EntityId, component_class: Type[Component1]) -> Component1: ...
 
     @overload
@@ -0,0 +1,175 @@
+from typing import Type, Any, Iterable
+
+from src.core.types import EntityId, Component, component_class_of
+
+
+class EntityIndex:
+    """
+    Вспомогательная структура, которую ECS поддерживает в актуальном состоянии.
+    Изменения полей компонентов видны индексу только через ecs.mark_changed или ecs.add_component
+    """
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        pass
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        pass
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        pass
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        pass
+
+    def invalidate(self) -> None:
+        """Вызывается до и после систем тика: поля вроде координат могли измениться без отметок"""
+        pass
+
+
+class RelationIndex(EntityIndex):
+    """Обратный индекс ссылок: цель -> сущности, у которых поле field компонента component_class указывает на неё"""
+
+    def __init__(self, component_class: Type[Component], field: str):
+        self.component_class = component_class
+        self.field = field
+        self._sources: dict[EntityId, dict[EntityId, Component]] = {}
+        self._targets: dict[EntityId, EntityId] = {}
+
+    def _link(self, source_id: EntityId, component: Component) -> None:
+        target_id = getattr(component, self.field)
+        old_target_id = self._targets.get(source_id)
+        if old_target_id is not None and old_target_id != target_id:
+            self._unlink(source_id)
+
+        if target_id is None:
+            return
+        self._targets[source_id] = target_id
+        self._sources.setdefault(target_id, {})[source_id] = component
+
+    def _unlink(self, source_id: EntityId) -> None:
+        target_id = self._targets.pop(source_id, None)
+        sources = self._sources.get(target_id)
+        if sources is None:
+            return
+
+        sources.pop(source_id, None)
+        if not sources:
+            del self._sources[target_id]
+
+    def sources(self, target_id: EntityId) -> list[tuple[EntityId, Component]]:
+        """Сущности, ссылающиеся на цель, вместе с их компонентом. Ссылки, изменённые без отметки, отбрасываются"""
+        return [(source_id, component) for source_id, component in self._sources.get(target_id, {}).items()
+                if getattr(component, self.field) == target_id]
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        component = components.get(self.component_class)
+        if component is not None:
+            self._link(entity_id, component)
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._unlink(entity_id)
+        for source_id in self._sources.pop(entity_id, {}):
+            self._targets.pop(source_id, None)
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        if isinstance(component, self.component_class):
+            self._link(entity_id, component)
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        if component_class is self.component_class:
+            self._unlink(entity_id)
+
+
+class PartitionIndex(EntityIndex):
+    """
+    Разбиение сущностей по значению неизменяемого поля field компонента component_class (например, по владельцу),
+    а внутри значения - ещё и по классам остальных компонентов
+    """
+
+    def __init__(self, component_class: Type[Component], field: str):
+        self.component_class = component_class
+        self.field = field
+        self._entities: dict[Any, set[EntityId]] = {}
+        self._entities_by_class: dict[tuple[Any, Type[Component]], set[EntityId]] = {}
+        self._keys: dict[EntityId, Any] = {}
+
+    def keys(self) -> Iterable[Any]:
+        return self._entities.keys()
+
+    def entities(self, key: Any) -> set[EntityId]:
+        """Возвращается сам хранимый набор, менять его нельзя"""
+        return self._entities.get(key, _EMPTY_SET)
+
+    def entities_with(self, key: Any, component_class: Type[Component]) -> set[EntityId]:
+        return self._entities_by_class.get((key, component_class), _EMPTY_SET)
+
+    def _add(self, entity_id: EntityId, components: Iterable[Type[Component]]) -> None:
+        key = self._keys[entity_id]
+        self._entities.setdefault(key, set()).add(entity_id)
+        for component_class in components:
+            self._entities_by_class.setdefault((key, component_class), set()).add(entity_id)
+
+    def _discard(self, entity_id: EntityId, key: Any, component_class: Type[Component]) -> None:
+        entity_ids = self._entities_by_class.get((key, component_class))
+        if entity_ids is None:
+            return
+        entity_ids.discard(entity_id)
+        if not entity_ids:
+            del self._entities_by_class[(key, component_class)]
+
+    def _remove(self, entity_id: EntityId, components: Iterable[Type[Component]]) -> None:
+        key = self._keys.pop(entity_id, _MISSING)
+        if key is _MISSING:
+            return
+
+        entity_ids = self._entities[key]
+        entity_ids.discard(entity_id)
+        if not entity_ids:
+            del self._entities[key]
+        for component_class in components:
+            self._discard(entity_id, key, component_class)
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        component = components.get(self.component_class)
+        if component is None:
+            return
+        self._keys[entity_id] = getattr(component, self.field)
+        self._add(entity_id, components)
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._remove(entity_id, components)
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        component_class = component_class_of(component)
+        if component_class is self.component_class:
+            key = getattr(component, self.field)
+            if self._keys.get(entity_id, _MISSING) == key:
+                return
+            component_classes = self._component_classes_of(entity_id)
+            self._remove(entity_id, component_classes)
+            self._keys[entity_id] = key
+            self._add(entity_id, component_classes | {component_class})
+            return
+
+        key = self._keys.get(entity_id, _MISSING)
+        if key is not _MISSING:
+            self._entities_by_class.setdefault((key, component_class), set()).add(entity_id)
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        key = self._keys.get(entity_id, _MISSING)
+        if key is _MISSING:
+            return
+
+        if component_class is self.component_class:
+            self._remove(entity_id, self._component_classes_of(entity_id))
+        else:
+            self._discard(entity_id, key, component_class)
+
+    def _component_classes_of(self, entity_id: EntityId) -> set[Type[Component]]:
+        key = self._keys.get(entity_id, _MISSING)
+        return {component_class for (other_key, component_class), entity_ids in self._entities_by_class.items()
+                if other_key == key and entity_id in entity_ids}
+
+
+_EMPTY_SET: frozenset = frozenset()
+_MISSING = object()
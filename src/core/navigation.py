@@ -0,0 +1,271 @@
+import heapq
+import math
+from collections import OrderedDict
+from typing import Type
+
+from src.components.base.collider import ColliderComponent
+from src.components.base.position import PositionComponent
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component
+
+Cell = tuple[int, int]
+
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
+NEIGHBOURS = ((1, 0, STRAIGHT_COST), (-1, 0, STRAIGHT_COST), (0, 1, STRAIGHT_COST), (0, -1, STRAIGHT_COST),
+              (1, 1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST))
+UNREACHABLE = 1 << 30
+
+
+class FlowField:
+    """
+    Расстояния до цели, общие для всех юнитов, идущих к ней. Юниту, который видит цель, они не нужны,
+    поэтому Дейкстра запускается только при первом юните за препятствием и только в окне вокруг него и цели.
+    Юнит вне окна расширяет окно и поле пересчитывается
+    """
+    MARGIN = 8  # клеток вокруг окна, чтобы путь мог обогнуть здание
+
+    def __init__(self, grid: 'NavigationGrid', goal: Cell):
+        self.grid = grid
+        self.goal = goal
+        self.window: tuple[int, int, int, int] | None = None  # min_x, min_y, max_x, max_y
+        self._distances: list[int] = []
+        self._waypoints: dict[Cell, Cell] = {}
+
+    def _covers(self, cell: Cell) -> bool:
+        return self.window is not None and self.window[0] <= cell[0] <= self.window[2] \
+            and self.window[1] <= cell[1] <= self.window[3]
+
+    def _extend(self, cell: Cell) -> None:
+        cells = [self.goal, cell] if self.window is None else [self.window[:2], self.window[2:], cell]
+        self.window = self.grid.clip_window(min(c[0] for c in cells) - self.MARGIN,
+                                            min(c[1] for c in cells) - self.MARGIN,
+                                            max(c[0] for c in cells) + self.MARGIN,
+                                            max(c[1] for c in cells) + self.MARGIN)
+        self._distances = self.grid.distances_to(self.goal, self.window)
+        self._waypoints = {cell: waypoint for cell, waypoint in self._waypoints.items() if waypoint == self.goal}
+
+    def distance(self, cell: Cell) -> int:
+        if not self._covers(cell):
+            return UNREACHABLE
+        min_x, min_y, _, max_y = self.window
+        return self._distances[(cell[0] - min_x) * (max_y - min_y + 1) + cell[1] - min_y]
+
+    def waypoint(self, cell: Cell) -> Cell | None:
+        """Клетка, к центру которой стоит идти из cell. None - из клетки цель недостижима"""
+        waypoint = self._waypoints.get(cell)
+        if waypoint is not None:
+            return waypoint
+
+        if self.grid.is_line_clear(cell, self.goal):
+            waypoint = self.goal
+        else:
+            if not self._covers(cell):
+                self._extend(cell)
+            best_distance = self.distance(cell)
+            waypoint = None
+            for neighbour, _ in self.grid.passable_neighbours(cell):
+                neighbour_distance = self.distance(neighbour)
+                if neighbour_distance < best_distance:
+                    waypoint, best_distance = neighbour, neighbour_distance
+            if waypoint is None:
+                # юнита прижало к зданию или он появился в его запасе: сначала выходит на ближайшую свободную клетку
+                waypoint = self._nearest_reachable(cell)
+                if waypoint is None:
+                    return None
+        self._waypoints[cell] = waypoint
+        return waypoint
+
+    def _nearest_reachable(self, cell: Cell) -> Cell | None:
+        """Ближайшая к cell клетка с путём до цели, из одинаково далёких выбирается самая близкая к цели"""
+        cell_x, cell_y = cell
+        for radius in range(1, self.MARGIN + 1):
+            ring = [(cell_x + offset_x, cell_y + offset_y)
+                    for offset_x in range(-radius, radius + 1) for offset_y in range(-radius, radius + 1)
+                    if max(abs(offset_x), abs(offset_y)) == radius]
+            reachable = [(self.distance(ring_cell), ring_cell) for ring_cell in ring
+                         if self.distance(ring_cell) != UNREACHABLE]
+            if reachable:
+                return min(reachable)[1]
+        return None
+
+
+class NavigationGrid(EntityIndex):
+    """
+    Клетки мира, перекрытые статичными коллайдерами с запасом clearance на радиус юнита,
+    и кэш полей потоков по клетке цели. Поля сбрасываются, когда появляется или исчезает препятствие
+    """
+    DEFAULT_CELL_SIZE = 40
+    MAX_FIELDS = 16
+
+    def __init__(self, world_half_size: float, cell_size: int = DEFAULT_CELL_SIZE, clearance: float = 8):
+        self.cell_size = cell_size
+        self.clearance = clearance
+        self.min_cell = int(-world_half_size // cell_size)
+        self.max_cell = int(world_half_size // cell_size)
+        self._blocked: dict[Cell, int] = {}  # сколько препятствий перекрывает клетку
+        self._obstacle_cells: dict[EntityId, list[Cell]] = {}
+        self._fields: OrderedDict[Cell, FlowField] = OrderedDict()
+        self.searches = 0
+
+    def cell_of(self, x: float, y: float) -> Cell:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def cell_center(self, cell: Cell) -> tuple[float, float]:
+        return (cell[0] + 0.5) * self.cell_size, (cell[1] + 0.5) * self.cell_size
+
+    def is_blocked(self, cell: Cell) -> bool:
+        return cell in self._blocked
+
+    def _in_bounds(self, cell: Cell) -> bool:
+        return self.min_cell <= cell[0] <= self.max_cell and self.min_cell <= cell[1] <= self.max_cell
+
+    def passable_neighbours(self, cell: Cell) -> list[tuple[Cell, int]]:
+        """Соседи с ценой шага. По диагонали нельзя срезать угол препятствия"""
+        blocked = self._blocked
+        cell_x, cell_y = cell
+        neighbours = []
+        for offset_x, offset_y, cost in NEIGHBOURS:
+            neighbour = cell_x + offset_x, cell_y + offset_y
+            if neighbour in blocked or not self._in_bounds(neighbour):
+                continue
+            if offset_x and offset_y and ((cell_x + offset_x, cell_y) in blocked or (cell_x, cell_y + offset_y) in blocked):
+                continue
+            neighbours.append((neighbour, cost))
+        return neighbours
+
+    def clip_window(self, min_x: int, min_y: int, max_x: int, max_y: int) -> tuple[int, int, int, int]:
+        return max(min_x, self.min_cell), max(min_y, self.min_cell), min(max_x, self.max_cell), min(max_y, self.max_cell)
+
+    def distances_to(self, goal: Cell, window: tuple[int, int, int, int]) -> list[int]:
+        """
+        Дейкстра от цели по клеткам окна, построчно в плоском списке. Сама цель считается проходимой,
+        даже если на ней здание. Клетки хранятся числами, чтобы не создавать кортежи в цикле
+        """
+        self.searches += 1
+        min_x, min_y, max_x, max_y = window
+        width, height = max_x - min_x + 1, max_y - min_y + 1
+        blocked = bytearray(width * height)
+        for cell_x, cell_y in self._blocked:
+            if min_x <= cell_x <= max_x and min_y <= cell_y <= max_y:
+                blocked[(cell_x - min_x) * height + cell_y - min_y] = 1
+
+        start = (goal[0] - min_x) * height + goal[1] - min_y
+        blocked[start] = 0
+        distances = [UNREACHABLE] * (width * height)
+        distances[start] = 0
+        queue = [(0, start)]
+        pop, push = heapq.heappop, heapq.heappush
+        while queue:
+            distance, index = pop(queue)
+            if distance > distances[index]:
+                continue
+            x, y = divmod(index, height)
+            for offset_x, offset_y, cost in NEIGHBOURS:
+                neighbour_x, neighbour_y = x + offset_x, y + offset_y
+                if not (0 <= neighbour_x < width and 0 <= neighbour_y < height):
+                    continue
+                neighbour = neighbour_x * height + neighbour_y
+                if blocked[neighbour]:
+                    continue
+                if offset_x and offset_y and (blocked[neighbour_x * height + y] or blocked[x * height + neighbour_y]):
+                    continue
+                neighbour_distance = distance + cost
+                if neighbour_distance < distances[neighbour]:
+                    distances[neighbour] = neighbour_distance
+                    push(queue, (neighbour_distance, neighbour))
+        return distances
+
+    def is_line_clear(self, start: Cell, end: Cell) -> bool:
+        """Нет ли препятствий на отрезке между центрами клеток, проверяется с шагом в полклетки"""
+        steps = 2 * max(abs(end[0] - start[0]), abs(end[1] - start[1]))
+        blocked = self._blocked
+        for step in range(1, steps):
+            cell = (math.floor(start[0] + 0.5 + (end[0] - start[0]) * step / steps),
+                    math.floor(start[1] + 0.5 + (end[1] - start[1]) * step / steps))
+            if cell in blocked and cell != end:
+                return False
+        return True
+
+    def flow_field(self, goal: tuple[float, float]) -> FlowField:
+        goal_cell = self.cell_of(*goal)
+        field = self._fields.get(goal_cell)
+        if field is not None:
+            self._fields.move_to_end(goal_cell)
+            return field
+
+        field = self._fields[goal_cell] = FlowField(self, goal_cell)
+        if len(self._fields) > self.MAX_FIELDS:
+            self._fields.popitem(last=False)
+        return field
+
+    def steering_target(self, position: PositionComponent, goal: tuple[float, float]) -> tuple[float, float] | None:
+        """Центр клетки, на которую юниту нужно повернуть по пути к goal. None - цель видна, можно идти напрямую"""
+        field = self.flow_field(goal)
+        waypoint = field.waypoint(self.cell_of(position.x, position.y))
+        if waypoint is None or waypoint == field.goal:
+            return None
+        return self.cell_center(waypoint)
+
+    def _block(self, entity_id: EntityId, collider: ColliderComponent, position: PositionComponent) -> None:
+        reach = collider.radius + self.clearance
+        min_cell, max_cell = self.cell_of(position.x - reach, position.y - reach), \
+            self.cell_of(position.x + reach, position.y + reach)
+        cells = []
+        for cell_x in range(min_cell[0], max_cell[0] + 1):
+            for cell_y in range(min_cell[1], max_cell[1] + 1):
+                center_x, center_y = self.cell_center((cell_x, cell_y))
+                if math.hypot(center_x - position.x, center_y - position.y) <= reach:
+                    cells.append((cell_x, cell_y))
+                    self._blocked[(cell_x, cell_y)] = self._blocked.get((cell_x, cell_y), 0) + 1
+        self._obstacle_cells[entity_id] = cells
+        self._fields.clear()
+
+    def _unblock(self, entity_id: EntityId) -> None:
+        cells = self._obstacle_cells.pop(entity_id, None)
+        if cells is None:
+            return
+
+        for cell in cells:
+            self._blocked[cell] -= 1
+            if not self._blocked[cell]:
+                del self._blocked[cell]
+        self._fields.clear()
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        collider = components.get(ColliderComponent)
+        position = components.get(PositionComponent)
+        if collider is not None and collider.static and position is not None:
+            self._block(entity_id, collider, position)
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._unblock(entity_id)
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        if component_class is ColliderComponent or component_class is PositionComponent:
+            self._unblock(entity_id)
+
+
+def test():
+    grid = NavigationGrid(world_half_size=1000)
+    building = {ColliderComponent: ColliderComponent(radius=60, static=True), PositionComponent: PositionComponent(0, 0)}
+    grid.on_entity_created(1, building)
+
+    goal = (0, 300)
+    assert grid.steering_target(PositionComponent(0, -200), goal) is not None
+
+    # юнит внутри запаса вокруг здания, его клетка заблокирована
+    stuck = PositionComponent(30, -30)
+    assert grid.is_blocked(grid.cell_of(stuck.x, stuck.y))
+    target = grid.steering_target(stuck, goal)
+    assert target is not None
+    target_cell = grid.cell_of(*target)
+    assert not grid.is_blocked(target_cell)
+    assert grid.flow_field(goal).distance(target_cell) != UNREACHABLE
+
+    grid.on_entity_removed(1, building)
+    assert grid.steering_target(stuck, goal) is None
+
+
+if __name__ == '__main__':
+    test()
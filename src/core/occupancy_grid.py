@@ -0,0 +1,88 @@
+from typing import Type, Callable, Iterator
+
+from pygame import Rect
+
+from src.components.base.position import PositionComponent
+from src.components.base.texture import TextureComponent
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component
+
+Cell = tuple[int, int]
+
+
+class OccupancyGrid(EntityIndex):
+    """
+    Клетки cell_size x cell_size с неподвижными сущностями, прямоугольник текстуры которых задевает клетку.
+    Неподвижна ли сущность, решает is_static по её компонентам при создании.
+    Проверка места стоит столько, сколько клеток занимает проверяемый прямоугольник
+    """
+    DEFAULT_CELL_SIZE = 32
+
+    def __init__(self, is_static: Callable[[dict[Type[Component], Component]], bool],
+                 cell_size: int = DEFAULT_CELL_SIZE):
+        self.is_static = is_static
+        self.cell_size = cell_size
+        self._footprints: dict[EntityId, Rect] = {}
+        self._cells: dict[Cell, set[EntityId]] = {}
+
+    def __len__(self):
+        return len(self._footprints)
+
+    def _cells_of(self, rect: Rect) -> Iterator[Cell]:
+        cell_size = self.cell_size
+        for cell_x in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+            for cell_y in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+                yield cell_x, cell_y
+
+    def _occupy(self, entity_id: EntityId, texture: TextureComponent, center: tuple[float, float]) -> None:
+        self._free(entity_id)
+        rect = self._footprints[entity_id] = texture.texture.get_rect()
+        rect.center = center
+        for cell in self._cells_of(rect):
+            self._cells.setdefault(cell, set()).add(entity_id)
+
+    def _free(self, entity_id: EntityId) -> None:
+        rect = self._footprints.pop(entity_id, None)
+        if rect is None:
+            return
+
+        for cell in self._cells_of(rect):
+            entity_ids = self._cells[cell]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._cells[cell]
+
+    def is_free(self, rect: Rect) -> bool:
+        footprints = self._footprints
+        for cell in self._cells_of(rect):
+            for entity_id in self._cells.get(cell, ()):
+                if footprints[entity_id].colliderect(rect):
+                    return False
+        return True
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        texture = components.get(TextureComponent)
+        position = components.get(PositionComponent)
+        if texture is not None and position is not None and self.is_static(components):
+            self._occupy(entity_id, texture, position.to_tuple())
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._free(entity_id)
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        rect = self._footprints.get(entity_id)
+        if rect is None:
+            return
+
+        if isinstance(component, TextureComponent):
+            self._occupy(entity_id, component, rect.center)
+        elif isinstance(component, PositionComponent):
+            self._free(entity_id)
+            moved_rect = self._footprints[entity_id] = rect
+            moved_rect.center = component.to_tuple()
+            for cell in self._cells_of(moved_rect):
+                self._cells.setdefault(cell, set()).add(entity_id)
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        if component_class is TextureComponent or component_class is PositionComponent:
+            self._free(entity_id)
@@ -0,0 +1,38 @@
+from collections import deque
+
+
+class SystemProfiler:
+    """
+    Время, число обработанных сущностей и вызовов каждой системы за последние window тиков.
+    Пропущенный из-за interval тик записывается нулями, поэтому средние считаются на тик
+    """
+
+    def __init__(self, window: int = 120):
+        self.window = window
+        self._samples: dict[str, deque[tuple[float, int, int]]] = {}
+
+    def add_system(self, system_name: str) -> None:
+        """Записи создаются заранее, чтобы системы из разных потоков не меняли словарь"""
+        self._samples.setdefault(system_name, deque(maxlen=self.window))
+
+    def record(self, system_name: str, seconds: float, entities: int, calls: int) -> None:
+        self._samples[system_name].append((seconds, entities, calls))
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        stats = {}
+        for system_name, samples in self._samples.items():
+            ticks = len(samples) or 1
+            stats[system_name] = {
+                'avg_ms': sum(sample[0] for sample in samples) * 1000 / ticks,
+                'max_ms': max((sample[0] for sample in samples), default=0.0) * 1000,
+                'entities': sum(sample[1] for sample in samples) / ticks,
+                'calls': sum(sample[2] for sample in samples) / ticks,
+            }
+        return stats
+
+    def top(self, count: int) -> list[tuple[str, dict[str, float]]]:
+        return sorted(self.as_dict().items(), key=lambda item: item[1]['avg_ms'], reverse=True)[:count]
+
+    def reset(self) -> None:
+        for samples in self._samples.values():
+            samples.clear()
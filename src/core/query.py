@@ -0,0 +1,51 @@
+from typing import Type, Iterator
+
+from src.core.archetype import Archetype
+from src.core.types import EntityId, Component
+
+
+class Query:
+    """
+    Сохранённый запрос сущностей по набору компонентов.
+    Список подходящих архетипов дополняется самой ECS при появлении нового архетипа,
+    поэтому повторный запрос стоит O(количества найденных сущностей)
+    """
+
+    def __init__(self, component_classes: tuple[Type[Component], ...], archetypes: list[Archetype]):
+        self.component_classes = component_classes
+        self.archetypes = archetypes
+
+    def __iter__(self) -> Iterator[tuple[EntityId, tuple]]:
+        for archetype in self.archetypes.copy():
+            yield from archetype.iterate(self.component_classes)
+
+    def __len__(self):
+        return sum(len(archetype) for archetype in self.archetypes)
+
+    def matches(self, archetype: Archetype) -> bool:
+        return archetype.matches(self.component_classes)
+
+    def entity_ids(self) -> set[EntityId]:
+        return {entity_id for archetype in self.archetypes for entity_id in archetype.entity_ids}
+
+
+class QueryStats:
+    def __init__(self):
+        self.hits = 0
+        self.builds = 0
+        self.archetype_updates = 0
+
+    def as_dict(self) -> dict[str, float]:
+        requests = self.hits + self.builds
+        return {
+            'hits': self.hits,
+            'builds': self.builds,
+            'archetype_updates': self.archetype_updates,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'build_rate': self.builds / requests if requests else 0.0,
+        }
+
+    def reset(self):
+        self.hits = 0
+        self.builds = 0
+        self.archetype_updates = 0
@@ -0,0 +1,282 @@
+import math
+import threading
+from typing import Type, Callable, Iterable, Iterator
+
+from src.components.base.position import PositionComponent
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component, component_class_of
+
+Cell = tuple[int, int]
+
+
+class SpatialHash(EntityIndex):
+    """
+    Равномерная сетка по PositionComponent для сущностей, у которых есть ещё и все component_classes.
+    Системы двигают позиции без отметок, поэтому ECS вызывает invalidate, а ячейки пересчитываются
+    перед первым запросом после этого. Расстояния в запросах считаются по текущим координатам
+    """
+    DEFAULT_CELL_SIZE = 128
+
+    def __init__(self, component_classes: Iterable[Type[Component]] = (), cell_size: float = DEFAULT_CELL_SIZE):
+        self.required_classes = frozenset(component_classes) | {PositionComponent}
+        self.cell_size = cell_size
+        self._present: dict[EntityId, set[Type[Component]]] = {}
+        self._positions: dict[EntityId, PositionComponent] = {}
+        self._pending_positions: dict[EntityId, PositionComponent] = {}  # у сущности есть не все component_classes
+        self._entity_cells: dict[EntityId, Cell] = {}
+        self._cells: dict[Cell, set[EntityId]] = {}
+        self._bounds: list[int] | None = None  # min_x, min_y, max_x, max_y занятых ячеек, только растут
+        self._stale = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _cell_of(self, x: float, y: float) -> Cell:
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def _put(self, entity_id: EntityId, cell: Cell) -> None:
+        self._entity_cells[entity_id] = cell
+        self._cells.setdefault(cell, set()).add(entity_id)
+        if self._bounds is None:
+            self._bounds = [cell[0], cell[1], cell[0], cell[1]]
+            return
+
+        bounds = self._bounds
+        bounds[0], bounds[1] = min(bounds[0], cell[0]), min(bounds[1], cell[1])
+        bounds[2], bounds[3] = max(bounds[2], cell[0]), max(bounds[3], cell[1])
+
+    def _take(self, entity_id: EntityId) -> None:
+        cell = self._entity_cells.pop(entity_id)
+        entity_ids = self._cells[cell]
+        entity_ids.discard(entity_id)
+        if not entity_ids:
+            del self._cells[cell]
+
+    def _insert(self, entity_id: EntityId, position: PositionComponent) -> None:
+        if entity_id in self._positions:
+            self._take(entity_id)
+        self._positions[entity_id] = position
+        self._put(entity_id, self._cell_of(position.x, position.y))
+
+    def _discard(self, entity_id: EntityId) -> None:
+        if self._positions.pop(entity_id, None) is not None:
+            self._take(entity_id)
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def refresh(self) -> None:
+        """Переносит сдвинувшиеся сущности в новые ячейки"""
+        if not self._stale:
+            return
+
+        with self._lock:
+            if not self._stale:
+                return
+
+            cell_size = self.cell_size
+            entity_cells = self._entity_cells
+            for entity_id, position in self._positions.items():
+                cell = int(position.x // cell_size), int(position.y // cell_size)
+                if cell != entity_cells[entity_id]:
+                    self._take(entity_id)
+                    self._put(entity_id, cell)
+            self._stale = False
+
+    def _cells_in_range(self, min_cell: Cell, max_cell: Cell) -> Iterator[set[EntityId]]:
+        if self._bounds is None:
+            return
+        min_x, min_y = max(min_cell[0], self._bounds[0]), max(min_cell[1], self._bounds[1])
+        max_x, max_y = min(max_cell[0], self._bounds[2]), min(max_cell[1], self._bounds[3])
+        if min_x > max_x or min_y > max_y:
+            return
+
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self._cells):
+            for (cell_x, cell_y), entity_ids in self._cells.items():
+                if min_x <= cell_x <= max_x and min_y <= cell_y <= max_y:
+                    yield entity_ids
+            return
+
+        cells = self._cells
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                entity_ids = cells.get((cell_x, cell_y))
+                if entity_ids is not None:
+                    yield entity_ids
+
+    def _ring(self, center: Cell, radius: int) -> Iterator[set[EntityId]]:
+        """Ячейки на границе квадрата со стороной 2 * radius + 1 вокруг center"""
+        if radius == 0:
+            entity_ids = self._cells.get(center)
+            if entity_ids is not None:
+                yield entity_ids
+            return
+
+        center_x, center_y = center
+        cells = self._cells
+        for cell_x in range(center_x - radius, center_x + radius + 1):
+            for cell_y in (center_y - radius, center_y + radius):
+                entity_ids = cells.get((cell_x, cell_y))
+                if entity_ids is not None:
+                    yield entity_ids
+        for cell_y in range(center_y - radius + 1, center_y + radius):
+            for cell_x in (center_x - radius, center_x + radius):
+                entity_ids = cells.get((cell_x, cell_y))
+                if entity_ids is not None:
+                    yield entity_ids
+
+    def query_radius(self, x: float, y: float, radius: float) -> list[EntityId]:
+        self.refresh()
+        radius_squared = radius * radius
+        positions = self._positions
+        result = []
+        for entity_ids in self._cells_in_range(self._cell_of(x - radius, y - radius),
+                                               self._cell_of(x + radius, y + radius)):
+            for entity_id in entity_ids:
+                position = positions[entity_id]
+                if (position.x - x) ** 2 + (position.y - y) ** 2 <= radius_squared:
+                    result.append(entity_id)
+        return result
+
+    def query_rect(self, left: float, top: float, width: float, height: float) -> list[EntityId]:
+        self.refresh()
+        right, bottom = left + width, top + height
+        positions = self._positions
+        result = []
+        for entity_ids in self._cells_in_range(self._cell_of(left, top), self._cell_of(right, bottom)):
+            for entity_id in entity_ids:
+                position = positions[entity_id]
+                if left <= position.x < right and top <= position.y < bottom:
+                    result.append(entity_id)
+        return result
+
+    def nearest(self, x: float, y: float, max_distance: float = math.inf,
+                filter: Callable[[EntityId], bool] | None = None) -> EntityId | None:
+        """Ближайшая сущность, для которой filter вернул True. Кольца ячеек перебираются от центра наружу"""
+        self.refresh()
+        if self._bounds is None:
+            return None
+
+        center = self._cell_of(x, y)
+        min_x, min_y, max_x, max_y = self._bounds
+        max_ring = max(center[0] - min_x, max_x - center[0], center[1] - min_y, max_y - center[1])
+        if max_distance != math.inf:
+            max_ring = min(max_ring, int(max_distance // self.cell_size) + 1)
+
+        positions = self._positions
+        best_entity_id = None
+        best_distance_squared = max_distance * max_distance
+        for ring in range(max_ring + 1):
+            # точка лежит где-то в центральной ячейке, поэтому до кольца ring не ближе (ring - 1) * cell_size
+            if best_entity_id is not None and best_distance_squared <= ((ring - 1) * self.cell_size) ** 2:
+                break
+
+            for entity_ids in self._ring(center, ring):
+                for entity_id in entity_ids:
+                    position = positions[entity_id]
+                    distance_squared = (position.x - x) ** 2 + (position.y - y) ** 2
+                    if distance_squared > best_distance_squared:
+                        continue
+                    if distance_squared == best_distance_squared and best_entity_id is not None:
+                        continue
+                    if filter is not None and not filter(entity_id):
+                        continue
+                    best_entity_id, best_distance_squared = entity_id, distance_squared
+        return best_entity_id
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        present = self.required_classes.intersection(components)
+        if not present:
+            return
+
+        self._present[entity_id] = set(present)
+        position = components.get(PositionComponent)
+        if position is None:
+            return
+        if len(present) == len(self.required_classes):
+            self._insert(entity_id, position)
+        else:
+            self._pending_positions[entity_id] = position
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._present.pop(entity_id, None)
+        self._pending_positions.pop(entity_id, None)
+        self._discard(entity_id)
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        component_class = component_class_of(component)
+        if component_class not in self.required_classes:
+            return
+
+        present = self._present.setdefault(entity_id, set())
+        present.add(component_class)
+        if component_class is PositionComponent:
+            position = component
+        else:
+            position = self._pending_positions.get(entity_id)
+            if position is None:
+                return
+
+        if len(present) == len(self.required_classes):
+            self._pending_positions.pop(entity_id, None)
+            self._insert(entity_id, position)
+        else:
+            self._pending_positions[entity_id] = position
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        present = self._present.get(entity_id)
+        if present is None or component_class not in present:
+            return
+
+        present.discard(component_class)
+        if not present:
+            del self._present[entity_id]
+
+        position = self._positions.get(entity_id)
+        self._discard(entity_id)
+        if component_class is PositionComponent:
+            self._pending_positions.pop(entity_id, None)
+        elif position is not None:
+            self._pending_positions[entity_id] = position
+
+
+def test():
+    from src.components.fighting.health import HealthComponent
+    from src.core.entity_component_system import EntityComponentSystem
+
+    ecs = EntityComponentSystem()
+    ecs.init_component(PositionComponent)
+    ecs.init_component(HealthComponent)
+    grid = ecs.init_spatial_hash(cell_size=10)
+    alive = ecs.init_spatial_hash((HealthComponent,), cell_size=10)
+
+    tree = ecs.create_entity([PositionComponent(0, 0)])
+    near = ecs.create_entity([PositionComponent(12, 0), HealthComponent(10, 10)])
+    far = ecs.create_entity([PositionComponent(-95, 40), HealthComponent(10, 10)])
+    assert grid.nearest(1, 1) == tree
+    assert alive.nearest(1, 1) == near
+    assert grid.nearest(1, 1, filter=lambda entity_id: entity_id != tree) == near
+    assert grid.nearest(-200, 40) == far
+    assert grid.nearest(-200, 40, max_distance=100) is None
+    assert sorted(grid.query_radius(0, 0, 12)) == sorted([tree, near])
+    assert grid.query_rect(-100, 30, 20, 20) == [far]
+
+    def move_system(position: PositionComponent, health: HealthComponent):
+        position.x += 100
+
+    ecs.init_system(move_system)
+    ecs.update()
+    assert alive.nearest(1, 1) == far
+    assert grid.query_radius(112, 0, 1) == [near]
+
+    ecs.remove_component(near, HealthComponent)
+    assert alive.nearest(112, 0) == far
+    ecs.add_component(near, HealthComponent(10, 10))
+    assert alive.nearest(112, 0) == near
+    ecs.remove_entity(near)
+    assert grid.query_radius(112, 0, 1) == []
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,30 @@
+from typing import Type
+
+from src.components.chase import ChaseComponent
+from src.components.fighting.damage_on_contact import DamageOnContactComponent
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component
+
+GROUND_LAYER = 0
+UNITS_LAYER = 1
+PROJECTILES_LAYER = 2
+LAYERS_COUNT = 3
+
+
+class SpriteLayers(EntityIndex):
+    """Слой отрисовки по компонентам при создании: здания и ресурсы, над ними юниты, сверху снаряды"""
+
+    def __init__(self):
+        self._layers: dict[EntityId, int] = {}
+
+    def get(self, entity_id: EntityId) -> int:
+        return self._layers.get(entity_id, GROUND_LAYER)
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        if DamageOnContactComponent in components:
+            self._layers[entity_id] = PROJECTILES_LAYER
+        elif ChaseComponent in components:
+            self._layers[entity_id] = UNITS_LAYER
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._layers.pop(entity_id, None)
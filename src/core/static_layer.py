@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import Type, Callable, Iterator
+
+import pygame
+from pygame import Rect, Surface
+
+from src.components.base.position import PositionComponent
+from src.components.base.texture import TextureComponent
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component
+
+Chunk = tuple[int, int]
+
+
+class StaticLayer(EntityIndex):
+    """
+    Неподвижные сущности, заранее нарисованные на прозрачные квадраты мира CHUNK_SIZE x CHUNK_SIZE.
+    Неподвижна ли сущность, решает is_static по её компонентам при создании. Квадрат перерисовывается
+    при первом показе после появления или исчезновения задевающей его сущности
+    """
+    CHUNK_SIZE = 512
+    MAX_CHUNKS = 64  # по мегабайту на квадрат, давно не показанные выкидываются
+
+    def __init__(self, is_static: Callable[[dict[Type[Component], Component]], bool]):
+        self.is_static = is_static
+        self._sprites: dict[EntityId, tuple[TextureComponent, PositionComponent]] = {}
+        self._sprite_chunks: dict[EntityId, list[Chunk]] = {}
+        self._chunk_sprites: dict[Chunk, set[EntityId]] = {}
+        self._surfaces: OrderedDict[Chunk, Surface] = OrderedDict()
+        self.renders = 0
+
+    def __contains__(self, entity_id: EntityId) -> bool:
+        return entity_id in self._sprites
+
+    def _chunks_of(self, rect: Rect) -> Iterator[Chunk]:
+        chunk_size = self.CHUNK_SIZE
+        for chunk_x in range(rect.left // chunk_size, (rect.right - 1) // chunk_size + 1):
+            for chunk_y in range(rect.top // chunk_size, (rect.bottom - 1) // chunk_size + 1):
+                yield chunk_x, chunk_y
+
+    def _add(self, entity_id: EntityId, texture: TextureComponent, position: PositionComponent) -> None:
+        self._remove(entity_id)
+        self._sprites[entity_id] = texture, position
+        image, top_left = texture.blit_sequence_item(position.to_tuple())
+        chunks = self._sprite_chunks[entity_id] = list(self._chunks_of(image.get_rect(topleft=top_left)))
+        for chunk in chunks:
+            self._chunk_sprites.setdefault(chunk, set()).add(entity_id)
+            self._surfaces.pop(chunk, None)
+
+    def _remove(self, entity_id: EntityId) -> None:
+        if self._sprites.pop(entity_id, None) is None:
+            return
+
+        for chunk in self._sprite_chunks.pop(entity_id):
+            entity_ids = self._chunk_sprites[chunk]
+            entity_ids.discard(entity_id)
+            if not entity_ids:
+                del self._chunk_sprites[chunk]
+            self._surfaces.pop(chunk, None)
+
+    def _render(self, chunk: Chunk) -> Surface:
+        self.renders += 1
+        surface = Surface((self.CHUNK_SIZE, self.CHUNK_SIZE), pygame.SRCALPHA)
+        origin_x, origin_y = chunk[0] * self.CHUNK_SIZE, chunk[1] * self.CHUNK_SIZE
+        sequence = []
+        for entity_id in sorted(self._chunk_sprites[chunk]):
+            texture, position = self._sprites[entity_id]
+            sequence.append(texture.blit_sequence_item((position.x - origin_x, position.y - origin_y)))
+        surface.blits(sequence, doreturn=False)
+        # квадраты в основном прозрачные, с RLE пустые участки пропускаются при отрисовке
+        surface.set_alpha(255, pygame.RLEACCEL)
+        return surface
+
+    def visible_chunks(self, view: Rect) -> list[tuple[Surface, tuple[int, int]]]:
+        """Квадраты с сущностями, задевающие view, и их левые верхние углы в координатах мира"""
+        result = []
+        for chunk in self._chunks_of(view):
+            if chunk not in self._chunk_sprites:
+                continue
+
+            surface = self._surfaces.get(chunk)
+            if surface is None:
+                surface = self._surfaces[chunk] = self._render(chunk)
+                if len(self._surfaces) > self.MAX_CHUNKS:
+                    self._surfaces.popitem(last=False)
+            else:
+                self._surfaces.move_to_end(chunk)
+            result.append((surface, (chunk[0] * self.CHUNK_SIZE, chunk[1] * self.CHUNK_SIZE)))
+        return result
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        texture = components.get(TextureComponent)
+        position = components.get(PositionComponent)
+        if texture is not None and position is not None and self.is_static(components):
+            self._add(entity_id, texture, position)
+
+    def on_entity_removed(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._remove(entity_id)
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        sprite = self._sprites.get(entity_id)
+        if sprite is None:
+            return
+
+        if isinstance(component, TextureComponent):
+            self._add(entity_id, component, sprite[1])
+        elif isinstance(component, PositionComponent):
+            self._add(entity_id, sprite[0], component)
+
+    def on_component_removed(self, entity_id: EntityId, component_class: Type[Component]) -> None:
+        if component_class is TextureComponent or component_class is PositionComponent:
+            self._remove(entity_id)
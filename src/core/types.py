@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Any, Type
+from typing import Any, Type, TYPE_CHECKING
 
 from pydantic import BaseModel
 from pygame import Color
@@ -8,6 +8,9 @@ from pygame import Color
 from src.constants import color_name_to_pygame_color, SoundCode
 from src.sound_player import play_sound
 
+if TYPE_CHECKING:
+    from src.core.query import Query
+
 
 @dataclass
 class RequiredCost:
@@ -72,9 +75,37 @@ class PlayerInfo(BaseModel):
         return f'{self.nick} with socket_id={self.socket_id}'
 
 
-EntityId = str
+EntityId = int
 Component = object
 
+# представления ColumnarStore подменяют компоненты в архетипах, но для ECS и сети это те же классы
+VIEW_COMPONENT_CLASSES: dict[type, Type[Component]] = {}
+
+
+def component_class_of(component: Component) -> Type[Component]:
+    """Класс, под которым компонент зарегистрирован в ECS и передаётся клиентам"""
+    component_class = component.__class__
+    return VIEW_COMPONENT_CLASSES.get(component_class, component_class)
+
+
+class ArgumentSource(IntEnum):
+    """Откуда берётся аргумент системы при позиционном вызове"""
+    COMPONENT = 0
+    VARIABLE = 1
+    ENTITY_ID = 2
+    ECS = 3
+
+
+class CommandType(IntEnum):
+    """Структурное изменение, отложенное до конца тика"""
+    CREATE_ENTITY = 0
+    REMOVE_ENTITY = 1
+    ADD_COMPONENT = 2
+    REMOVE_COMPONENT = 3
+
+
+CallPlan = tuple[tuple[ArgumentSource, Any], ...]  # по аргументу на каждый параметр системы, в порядке сигнатуры
+
 
 @dataclass
 class StoredSystem:
@@ -82,6 +113,11 @@ class StoredSystem:
     components: dict[str, Type[Component]]  # key is argument name
     has_entity_id_argument: bool
     has_ecs_argument: bool
+    batch: bool = False  # вызывается раз в тик со списками компонентов всех подходящих сущностей
+    query: 'Query | None' = None
+    call_plan: CallPlan | None = None  # None, если систему нельзя вызвать позиционно
+    interval: int = 1  # раз во сколько тиков обрабатывается каждая сущность
+    stagger: bool = False  # распределять сущности по тикам интервала вместо пропуска тиков
 
 
 @dataclass
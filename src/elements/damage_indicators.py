@@ -8,13 +8,14 @@ from src.constants import EVENT_UPDATE
 from src.core.camera import Camera
 from src.ui import UIElement
 from src.utils.math_utils import spread_position
+from src.utils.text import render_text, render_number, is_number
 
 
 class _DamageIndicator(Sprite):
     def __init__(self, label: str, position: tuple[float, float], font: Font, color: Color):
         super().__init__()
 
-        self.image = font.render(label, True, color)
+        self.image = render_number(font, label, color) if is_number(label) else render_text(font, label, color)
         self.rect = self.image.get_rect()
         self.rect.center = position
 
@@ -11,18 +11,43 @@ from src.components.fighting.health import HealthComponent
 from src.components.worker.uncompleted_building import UncompletedBuildingComponent
 from src.config import config, upload_config_to_disc
 from src.constants import color_name_to_pygame_color
+from src.core.bounding_boxes import init_bounding_boxes
 from src.core.camera import Camera
+from src.core.sprite_layers import SpriteLayers, LAYERS_COUNT
+from src.core.static_layer import StaticLayer
 from src.core.entity_component_system import EntityComponentSystem
-from src.core.types import PlayerInfo
+from src.core.types import PlayerInfo, EntityId
+from src.elements.system_stats import SystemStatsOverlay, RenderStats, RenderStatsLabel
+from src.utils.collision import is_static_footprint
+from src.utils.image import prebake_rotations
+from src.utils.text import render_text
 from src.ui import UIElement, FPSCounter, UIAnchor
 
 
 class EntitiesRenderer(UIElement):
+    NICK_OFFSET = 100
+    BAR_SIZE = (50, 5)
+    ROTATING_TEXTURES = ('assets/unit/archer/{color_name}.png', 'assets/unit/warrior/{color_name}.png',
+                         'assets/unit/ballista/{color_name}.png', 'assets/unit/worker/{color_name}.png',
+                         'assets/unit/archer/arrow.png', 'assets/unit/ballista/arrow.png')
+
     def __init__(self, ecs: EntityComponentSystem, camera: Camera, players: dict[int, PlayerInfo]):
         super().__init__()
         self._ecs = ecs
         self._camera = camera
         self._players = players
+        self._textured = ecs.init_spatial_hash((TextureComponent,))
+        self._bounding_boxes = init_bounding_boxes(ecs)
+        self._sprite_layers = ecs.add_index(SpriteLayers())
+        self._static_layer = ecs.add_index(StaticLayer(is_static_footprint))
+        self._bar_surfaces = {}
+        for color_name in ('gray', 'red', 'yellow'):
+            self._bar_surfaces[color_name] = Surface(self.BAR_SIZE)
+            self._bar_surfaces[color_name].fill(Color(color_name))
+        self._render_stats = RenderStats()
+        if config.screen.prebake_rotations:
+            prebake_rotations({texture_path.format(color_name=player.color_name)
+                               for texture_path in self.ROTATING_TEXTURES for player in players.values()})
         fps_font = Font('assets/fonts/arial.ttf', 30)
         self._nicks_font = pygame.font.SysFont('Comic Sans MS', 30)
 
@@ -31,59 +56,123 @@ class EntitiesRenderer(UIElement):
         self._fps_counter.enabled = config.world.show_debug_info
         self.append_child(self._fps_counter)
 
+        self._system_stats = SystemStatsOverlay(ecs, font=Font('assets/fonts/arial.ttf', 16),
+                                                position=config.screen.rect.move(-5, 45).topright)
+        self._system_stats.enabled = config.world.show_debug_info
+        self.append_child(self._system_stats)
+
+        stats_font = Font('assets/fonts/arial.ttf', 16)
+        self._render_stats_label = RenderStatsLabel(self._render_stats, font=stats_font, position=config.screen.rect.move(
+            -5, 45 + SystemStatsOverlay.LINES_COUNT * stats_font.get_linesize()).topright)
+        self._render_stats_label.enabled = config.world.show_debug_info
+        self.append_child(self._render_stats_label)
+
+    def get_visible_entities(self) -> list[EntityId]:
+        """Сущности, повёрнутый спрайт которых может попасть в камеру. Порядок по id, чтобы спрайты не мерцали"""
+        margin = self._bounding_boxes.max_half_diagonal
+        visible = self._textured.query_rect(-self._camera.offset_x - margin, -self._camera.offset_y - margin,
+                                            config.screen.width + 2 * margin, config.screen.height + 2 * margin)
+        visible.sort()
+        self._render_stats.culled = len(self._textured) - len(visible)
+        return visible
+
     def draw(self, screen: Surface):
-        self.draw_textures(screen)
-        self.draw_health_bars(screen)
-        self.draw_construction_bars(screen)
+        self._render_stats.draw_calls = 0
+        visible = self.get_visible_entities()
+        self.draw_textures(screen, visible)
+        self.draw_bars(screen, visible)
         self.draw_nicks(screen)
 
         if config.world.show_debug_info:
-            self.draw_debug(screen)
+            self.draw_debug(screen, visible)
 
     def draw_nicks(self, screen: Surface):
+        screen_rect = screen.get_rect()
         for _, (_, position, owner) in self._ecs.get_entities_with_components((CoreBuildingComponent,
                                                                                PositionComponent,
                                                                                PlayerOwnerComponent)):
-            text_image = self._nicks_font.render(self._players[owner.socket_id].nick, True,
-                                                 color_name_to_pygame_color[owner.color_name])
             center = position.position_according_to_camera(self._camera)
-            screen.blit(text_image, text_image.get_rect(center=(center[0], center[1] - 100)))
+            if not screen_rect.inflate(2 * self.NICK_OFFSET, 2 * self.NICK_OFFSET).collidepoint(center):
+                continue
+
+            text_image = render_text(self._nicks_font, self._players[owner.socket_id].nick,
+                                     color_name_to_pygame_color[owner.color_name])
+            screen.blit(text_image, text_image.get_rect(center=(center[0], center[1] - self.NICK_OFFSET)))
+            self._render_stats.draw_calls += 1
+
+    def draw_textures(self, screen: Surface, visible: list[EntityId]):
+        """
+        Сначала готовые квадраты с неподвижными сущностями, поверх них остальные спрайты по слоям.
+        Всё отдаётся в SDL одним вызовом blits на слой
+        """
+        offset_x, offset_y = self._camera.offset_x, self._camera.offset_y
+        chunks = self._static_layer.visible_chunks(Rect(-offset_x, -offset_y, config.screen.width, config.screen.height))
+        if chunks:
+            screen.blits([(surface, (x + offset_x, y + offset_y)) for surface, (x, y) in chunks], doreturn=False)
+            self._render_stats.draw_calls += 1
+        self._render_stats.chunks = len(chunks)
 
-    def draw_textures(self, screen: Surface):
-        for _, (texture, position) in self._ecs.get_entities_with_components((TextureComponent, PositionComponent)):
-            texture.blit(screen, position.position_according_to_camera(self._camera))
+        layers = [[] for _ in range(LAYERS_COUNT)]
+        for entity_id in visible:
+            if entity_id in self._static_layer:
+                continue
+            texture, position = self._ecs.get_components(entity_id, (TextureComponent, PositionComponent))
+            layers[self._sprite_layers.get(entity_id)].append(
+                texture.blit_sequence_item(position.position_according_to_camera(self._camera)))
+
+        self._render_stats.drawn = 0
+        for layer in layers:
+            if layer:
+                screen.blits(layer, doreturn=False)
+                self._render_stats.draw_calls += 1
+                self._render_stats.drawn += len(layer)
+
+    def draw_bars(self, screen: Surface, visible: list[EntityId]):
+        """Полоски здоровья и стройки: серый фон и обрезанная по прогрессу цветная полоска, всё одним blits"""
+        bar_width, bar_height = self.BAR_SIZE
+        background, health_bar, construction_bar = (self._bar_surfaces['gray'], self._bar_surfaces['red'],
+                                                    self._bar_surfaces['yellow'])
+        sequence = []
+        for entity_id in visible:
+            position = self._ecs.get_component(entity_id, PositionComponent)
+            x, y = position.position_according_to_camera(self._camera)
+            top_left = (x - bar_width / 2, y - bar_height / 2)
+
+            health = self._ecs.get_component(entity_id, HealthComponent)
+            if health is not None and health.amount != health.max_amount:
+                sequence.append((background, top_left))
+                sequence.append((health_bar, top_left, Rect(0, 0, bar_width * health.amount / health.max_amount,
+                                                            bar_height)))
 
-    def draw_health_bars(self, screen: Surface):
-        for _, (texture, health, position) in self._ecs.get_entities_with_components(
-                (TextureComponent, HealthComponent, PositionComponent)):
-            if health.amount == health.max_amount:
+            uncompleted_building = self._ecs.get_component(entity_id, UncompletedBuildingComponent)
+            if uncompleted_building is not None:
+                top_left = (top_left[0], top_left[1] - 5)
+                sequence.append((background, top_left))
+                sequence.append((construction_bar, top_left,
+                                 Rect(0, 0, bar_width * uncompleted_building.progress
+                                      / uncompleted_building.required_progress, bar_height)))
+
+        if sequence:
+            screen.blits(sequence, doreturn=False)
+            self._render_stats.draw_calls += 1
+
+    def draw_debug(self, screen: Surface, visible: list[EntityId]):
+        for entity_id in visible:
+            components = self._ecs.get_components(entity_id, (ColliderComponent, PositionComponent))
+            if components is None:
                 continue
-            health_rect = Rect(0, 0, 50, 5)
-            health_rect.center = position.position_according_to_camera(self._camera)
-            pygame.draw.rect(screen, Color('gray'), health_rect)
-            health_rect.width = health_rect.width * health.amount / health.max_amount
-            pygame.draw.rect(screen, Color('red'), health_rect)
-
-    def draw_construction_bars(self, screen: Surface):
-        for _, (texture, uncompleted_building, position) in self._ecs.get_entities_with_components(
-                (TextureComponent, UncompletedBuildingComponent, PositionComponent)):
-            health_rect = Rect(0, 0, 50, 5)
-            health_rect.center = position.position_according_to_camera(self._camera)
-            health_rect.move_ip(0, -5)
-            pygame.draw.rect(screen, Color('gray'), health_rect)
-            health_rect.width = health_rect.width * uncompleted_building.progress / uncompleted_building.required_progress
-            pygame.draw.rect(screen, Color('yellow'), health_rect)
-
-    def draw_debug(self, screen: Surface):
-        for _, (collider, position) in self._ecs.get_entities_with_components(
-                (ColliderComponent, PositionComponent)):
+
+            collider, position = components
             pygame.draw.circle(screen, Color('green') if collider.static else Color('lightgreen'),
                                position.position_according_to_camera(self._camera), collider.radius, 1)
+            self._render_stats.draw_calls += 1
 
     def on_key_up(self, key: int, unicode: str, mod: int, scancode: int) -> bool | None:
         if key == pygame.K_F3:
             config.world.show_debug_info = not config.world.show_debug_info
             self._fps_counter.enabled = config.world.show_debug_info
+            self._system_stats.enabled = config.world.show_debug_info
+            self._render_stats_label.enabled = config.world.show_debug_info
             upload_config_to_disc()
 
             return True
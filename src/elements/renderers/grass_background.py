@@ -1,9 +1,8 @@
 import math
 
 import pygame
-from pygame import Surface
+from pygame import Surface, Rect
 
-from src.config import config
 from src.core.camera import Camera
 from src.ui import UIElement
 
@@ -13,14 +12,24 @@ class GrassBackground(UIElement):
         super().__init__()
         self.camera = camera
         self.grass_sprite = pygame.image.load('assets/background/grass.png').convert()
+        self._tiled: Surface | None = None
+        self._tiled_for_size: tuple[int, int] | None = None
 
-    def draw(self, screen: Surface):
-        sprite_width = self.grass_sprite.get_width()
-        sprite_height = self.grass_sprite.get_height()
-        sprites_count = (math.ceil(config.screen.width / sprite_width), math.ceil(config.screen.height / sprite_height))
+    def bake(self, screen_size: tuple[int, int]):
+        """Замощает травой поверхность на клетку больше экрана, чтобы каждый кадр рисовать её одним blit"""
+        sprite_width, sprite_height = self.grass_sprite.get_size()
+        sprites_count = (math.ceil(screen_size[0] / sprite_width) + 1, math.ceil(screen_size[1] / sprite_height) + 1)
+
+        self._tiled = Surface((sprites_count[0] * sprite_width, sprites_count[1] * sprite_height)).convert()
+        self._tiled.blits([(self.grass_sprite, (j * sprite_width, i * sprite_height))
+                           for i in range(sprites_count[1]) for j in range(sprites_count[0])], doreturn=False)
+        self._tiled_for_size = screen_size
 
-        for i in range(-1, sprites_count[1]):
-            for j in range(-1, sprites_count[0]):
-                screen.blit(self.grass_sprite, (self.camera.offset_x % sprite_width + j * sprite_width,
-                                                self.camera.offset_y % sprite_height + i * sprite_height))
+    def draw(self, screen: Surface):
+        if self._tiled_for_size != screen.get_size():
+            self.bake(screen.get_size())
 
+        sprite_width, sprite_height = self.grass_sprite.get_size()
+        screen.blit(self._tiled, (0, 0), Rect(sprite_width - int(self.camera.offset_x % sprite_width),
+                                              sprite_height - int(self.camera.offset_y % sprite_height),
+                                              *screen.get_size()))
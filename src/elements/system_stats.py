@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from itertools import zip_longest
+
+from pygame import Color
+from pygame.font import Font
+
+from src.core.entity_component_system import EntityComponentSystem
+from src.ui import UIElement, UIAnchor
+from src.ui.text_label import TextLabel
+from src.ui.types import PositionType
+
+
+class SystemStatsOverlay(UIElement):
+    """Самые долгие системы ECS за последние тики, обновляется раз в секунду"""
+    LINES_COUNT = 6
+
+    def __init__(self, ecs: EntityComponentSystem, font: Font, position: PositionType,
+                 anchor: UIAnchor = UIAnchor.TOP_RIGHT, text_color: Color = Color('lightblue')):
+        super().__init__()
+        self._ecs = ecs
+        self._labels = []
+        for i in range(self.LINES_COUNT):
+            label = TextLabel(text='', font=font, text_color=text_color, anchor=anchor,
+                              position=(position[0], position[1] + i * font.get_linesize()))
+            self._labels.append(label)
+            self.append_child(label)
+
+    def on_second_passed(self):
+        for label, top_system in zip_longest(self._labels, self._ecs.profiler.top(self.LINES_COUNT)):
+            if top_system is None:
+                label.set_text('')
+                continue
+
+            system_name, stats = top_system
+            label.set_text(f'{system_name}: {stats["avg_ms"]:.2f} ms, '
+                           f'{stats["entities"]:.1f} entities, {stats["calls"]:.1f} calls')
+
+
+@dataclass
+class RenderStats:
+    """Счётчики последнего кадра EntitiesRenderer"""
+    drawn: int = 0
+    culled: int = 0
+    draw_calls: int = 0
+    chunks: int = 0  # квадратов с неподвижными сущностями
+
+
+class RenderStatsLabel(TextLabel):
+    """Сколько спрайтов нарисовано, сколько отброшено за пределами камеры и сколько было обращений к SDL за кадр"""
+
+    def __init__(self, render_stats: RenderStats, font: Font, position: PositionType,
+                 anchor: UIAnchor = UIAnchor.TOP_RIGHT, text_color: Color = Color('lightblue')):
+        super().__init__(text='', font=font, text_color=text_color, anchor=anchor, position=position)
+        self._render_stats = render_stats
+
+    def on_second_passed(self):
+        self.set_text(f'sprites: {self._render_stats.drawn} drawn, {self._render_stats.culled} culled, '
+                      f'{self._render_stats.chunks} static chunks, {self._render_stats.draw_calls} draw calls')
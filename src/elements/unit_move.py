@@ -79,13 +79,10 @@ class UnitMoveMenu(UIElement):
             self.mouse_grab_position = None
             return False
 
-        for entity_id, (position, chase, player) in self.ecs.get_entities_with_components(
-                (PositionComponent, ChaseComponent, PlayerOwnerComponent)):
-
-            if not selection_rect.collidepoint(*position.to_tuple()):
-                continue
-
-            if self.current_player.socket_id != player.socket_id:
+        owners = self.ecs.get_partition(PlayerOwnerComponent, 'socket_id')
+        for entity_id in owners.entities_with(self.current_player.socket_id, ChaseComponent):
+            position = self.ecs.get_component(entity_id, PositionComponent)
+            if position is None or not selection_rect.collidepoint(*position.to_tuple()):
                 continue
 
             self.selected_entities.add(entity_id)
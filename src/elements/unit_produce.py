@@ -196,14 +196,14 @@ class ProduceMenu(UIElement):
 
         mouse_pos = self._camera.get_in_game_mouse_position()
 
-        for entity_id, components in self._ecs.get_entities_with_components((UnitProductionComponent,
-                                                                             PositionComponent,
-                                                                             TextureComponent,
-                                                                             PlayerOwnerComponent)):
-            unit_production, position, texture, owner = components
-
-            if owner.socket_id != self._current_player.socket_id:
+        owners = self._ecs.get_partition(PlayerOwnerComponent, 'socket_id')
+        for entity_id in owners.entities_with(self._current_player.socket_id, UnitProductionComponent):
+            components = self._ecs.get_components(entity_id, (UnitProductionComponent,
+                                                              PositionComponent,
+                                                              TextureComponent))
+            if components is None:
                 continue
+            unit_production, position, texture = components
 
             rect: pygame.Rect = texture.texture.get_rect()
             rect.center = position.to_tuple()
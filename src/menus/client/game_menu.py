@@ -17,20 +17,25 @@ from src.components.minimap_icon import MinimapIconComponent
 from src.components.unit_production import UnitProductionComponent
 from src.components.worker.resource import ResourceComponent
 from src.components.worker.uncompleted_building import UncompletedBuildingComponent
+from src.config import config
 from src.constants import ClientCommands
 from src.core.entity_component_system import EntityComponentSystem
+from src.core.navigation import NavigationGrid
+from src.core.occupancy_grid import OccupancyGrid
 from src.core.types import PlayerInfo, EntityId, Component
 from src.elements.game_composer import GameComposer
 from src.main_loop_state import set_main_element
 from src.sound_player import play_music
-from src.systems.base.colliders import collider_system
-from src.systems.base.velocity import velocity_system
+from src.systems.base.colliders import collider_system, init_collider_broad_phase
+from src.systems.base.separation import separation_system
+from src.systems.base.velocity import velocity_system, columnar_velocity_system
 from src.systems.chase import chase_system
 from src.ui import UIElement
+from src.utils.collision import is_static_footprint
 
 
 class ClientGameMenu(UIElement):
-    def _init_ecs(self):
+    def _init_ecs(self, world_size: float):
         self.ecs.init_component(PositionComponent)
         self.ecs.init_component(VelocityComponent)
         self.ecs.init_component(DecayComponent)
@@ -45,13 +50,22 @@ class ClientGameMenu(UIElement):
         self.ecs.init_component(ColliderComponent)
         self.ecs.init_component(CoreBuildingComponent)
 
-        self.ecs.init_system(velocity_system)
-        self.ecs.init_system(chase_system)
+        self.ecs.init_partition(PlayerOwnerComponent, 'socket_id')
+        init_collider_broad_phase(self.ecs)
+        self.ecs.add_variable('occupancy_grid', self.ecs.add_index(OccupancyGrid(is_static_footprint)))
+        self.ecs.add_variable('navigation', self.ecs.add_index(NavigationGrid(world_size)))
+
+        if self.ecs.columnar_store is None:
+            self.ecs.init_system(velocity_system)
+        else:
+            self.ecs.init_batch_system(columnar_velocity_system)
+        self.ecs.init_batch_system(chase_system)
+        self.ecs.init_batch_system(separation_system)
         self.ecs.init_system(collider_system)
 
     def __init__(self, connection_to_server: socket.socket, received_actions: list[list], read_socket_process: Process,
                  write_action_connection: Connection, read_action_connection: Connection, send_process: Process,
-                 players: dict[int, PlayerInfo], socket_id: int):
+                 players: dict[int, PlayerInfo], socket_id: int, world_size: float):
         super().__init__()
 
         self.current_player = players[socket_id]
@@ -65,8 +79,8 @@ class ClientGameMenu(UIElement):
 
         self.action_sender = ClientActionSender(self.write_action)
 
-        self.ecs = EntityComponentSystem(on_create=self.on_create)
-        self._init_ecs()
+        self.ecs = EntityComponentSystem(on_create=self.on_create, columnar=config.world.columnar_positions)
+        self._init_ecs(world_size)  # размер мира хоста: навигация клиента должна совпадать с серверной
 
         self.game_composer = GameComposer(self.ecs, self.current_player, self.action_sender, players)
         self.append_child(self.game_composer)
@@ -76,6 +90,7 @@ class ClientGameMenu(UIElement):
         self.action_handler.add_hook(ClientCommands.RESOURCE_INFO,
                                      lambda *_: self.game_composer.resource_menu.update_values())
         self.action_handler.add_hook(ClientCommands.DEAD, self.handle_death)
+        self.action_handler.add_hook(ClientCommands.DEAD_BATCH, self.handle_deaths)
         self.action_handler.add_hook(ClientCommands.DEFEAT, self.game_composer.show_defeat_screen)
         self.action_handler.add_hook(ClientCommands.VICTORY, self.game_composer.show_victory_screen)
 
@@ -113,3 +128,7 @@ class ClientGameMenu(UIElement):
     def handle_death(self, entity_id: EntityId):
         self.game_composer.produce_menu.on_death(entity_id)
         self.game_composer.unit_move_menu.on_death(entity_id)
+
+    def handle_deaths(self, entity_ids: list[EntityId]):
+        for entity_id in entity_ids:
+            self.handle_death(entity_id)
@@ -47,7 +47,7 @@ class WaitForServerMenu(UIElement):
             command, *args = self.receive_list.pop(0)
             if command == 'start':
                 players = {int(i): j for i, j in args[1].items()}
-                self.start(int(args[0]), players)
+                self.start(int(args[0]), players, args[2])
                 return
             elif command == 'disconnect':
                 from src.menus.main_menu import MainMenu
@@ -59,10 +59,10 @@ class WaitForServerMenu(UIElement):
                 self.connected_players.extend(ConnectedPlayer(**player) for player in players)
                 self.players_list_element.update_players()
 
-    def start(self, team_id: int, players: dict[int, PlayerInfo]):
+    def start(self, team_id: int, players: dict[int, PlayerInfo], world_size: float):
         set_main_element(
             ClientGameMenu(self.sock, self.receive_list, self.socket_process, self.parent_conn, self.child_conn,
-                           self.send_process, players, team_id),
+                           self.send_process, players, team_id, world_size),
             shutdown_current_element=False)
 
     def shutdown(self):
@@ -4,95 +4,48 @@ from multiprocessing.connection import Connection
 from typing import Any
 
 from src.client.action_sender import ClientActionSender
-from src.components.base.collider import ColliderComponent
 from src.components.base.decay import DecayComponent
 from src.components.base.player_owner import PlayerOwnerComponent
-from src.components.base.position import PositionComponent
-from src.components.base.texture import TextureComponent
-from src.components.base.velocity import VelocityComponent
 from src.components.chase import ChaseComponent
 from src.components.core_building import CoreBuildingComponent
 from src.components.fighting.close_range_attack import CloseRangeAttackComponent
 from src.components.fighting.damage_on_contact import DamageOnContactComponent
 from src.components.fighting.enemy_finder import EnemyFinderComponent
-from src.components.fighting.health import HealthComponent
 from src.components.fighting.projectile_throw import ProjectileThrowComponent
 from src.components.meat import ReturnMeatOnDeathComponent, MaxMeatIncreaseComponent
-from src.components.minimap_icon import MinimapIconComponent
-from src.components.unit_production import UnitProductionComponent
 from src.components.worker.depot import ResourceDepotComponent
-from src.components.worker.resource import ResourceComponent
 from src.components.worker.resource_gatherer import ResourceGathererComponent
-from src.components.worker.uncompleted_building import UncompletedBuildingComponent
 from src.components.worker.work_finder import WorkFinderComponent
+from src.config import config
 from src.constants import HOST_PLAYER_ID
 from src.core.entity_component_system import EntityComponentSystem
-from src.core.types import PlayerInfo, Component, EntityId, PlayerState
+from src.core.types import PlayerInfo, Component, EntityId, PlayerState, component_class_of
 from src.elements.game_composer import GameComposer
 from src.server.action_handler import ServerActionHandler
 from src.server.action_sender import ServerActionSender
+from src.server.ecs_setup import init_server_ecs
 from src.server.level_setup import setup_level
 from src.server.socket_threads import Connections
 from src.sound_player import play_music
-from src.systems.base.colliders import collider_system
-from src.systems.base.death import death_system
-from src.systems.base.decay import decay_system
-from src.systems.base.velocity import velocity_system
-from src.systems.chase import chase_system
-from src.systems.fighting.close_range_attack import close_range_attack_system
-from src.systems.fighting.damage_on_contact import damage_on_contact_system
-from src.systems.fighting.enemy_finder import enemy_finder_system
-from src.systems.fighting.projectile_throw import projectile_throw_system
-from src.systems.max_meat_increase import max_meat_increase_system
-from src.systems.unit_production import unit_production_system
-from src.systems.worker.building_completion import building_completion_system
-from src.systems.worker.resource_gathering import working_system
-from src.systems.worker.work_finder import work_finder_system
 from src.ui import UIElement
 
 
 class ServerGameMenu(UIElement):
+    COMPONENTS_TO_EXCLUDE = (
+        DecayComponent,
+        EnemyFinderComponent,
+        ProjectileThrowComponent,
+        DamageOnContactComponent,
+        CloseRangeAttackComponent,
+        ReturnMeatOnDeathComponent,
+        MaxMeatIncreaseComponent,
+        WorkFinderComponent,
+        ResourceGathererComponent,
+        ResourceDepotComponent,
+    )  # нужны только серверу
+
     def _init_ecs(self):
-        self.game_composer.ecs.add_variable('action_sender', self.action_sender)
-        self.game_composer.ecs.add_variable('players', self.players)
-
-        self.ecs.init_component(PositionComponent)
-        self.ecs.init_component(VelocityComponent)
-        self.ecs.init_component(DecayComponent)
-        self.ecs.init_component(TextureComponent)
-        self.ecs.init_component(MinimapIconComponent)
-        self.ecs.init_component(UnitProductionComponent)
-        self.ecs.init_component(PlayerOwnerComponent)
-        self.ecs.init_component(ChaseComponent)
-        self.ecs.init_component(EnemyFinderComponent)
-        self.ecs.init_component(HealthComponent)
-        self.ecs.init_component(ProjectileThrowComponent)
-        self.ecs.init_component(DamageOnContactComponent)
-        self.ecs.init_component(CloseRangeAttackComponent)
-        self.ecs.init_component(ReturnMeatOnDeathComponent)
-        self.ecs.init_component(MaxMeatIncreaseComponent)
-        self.ecs.init_component(WorkFinderComponent)
-        self.ecs.init_component(ResourceComponent)
-        self.ecs.init_component(ResourceDepotComponent)
-        self.ecs.init_component(ResourceGathererComponent)
-        self.ecs.init_component(UncompletedBuildingComponent)
-        self.ecs.init_component(ColliderComponent)
-        self.ecs.init_component(CoreBuildingComponent)
-
-        self.ecs.init_system(velocity_system)
-        self.ecs.init_system(decay_system)
-        self.ecs.init_system(unit_production_system)
-        self.ecs.init_system(chase_system)
-        self.ecs.init_system(enemy_finder_system)
-        self.ecs.init_system(projectile_throw_system)
-        self.ecs.init_system(damage_on_contact_system)
-        self.ecs.init_system(close_range_attack_system)
-        self.ecs.init_system(death_system)
-        self.ecs.init_system(max_meat_increase_system)
-        self.ecs.init_system(work_finder_system)
-        self.ecs.init_system(working_system)
-        self.ecs.init_system(building_completion_system)
-        self.ecs.init_system(collider_system)
+        init_server_ecs(self.ecs, self.action_sender, self.players)
 
     def __init__(self, server_socket: socket.socket, connections: Connections, received_actions: list[tuple[int, Any]],
                  write_action_connection: Connection, send_process: Process, players: dict[int, PlayerInfo]):
@@ -106,7 +59,9 @@ class ServerGameMenu(UIElement):
         self.write_action_connection = write_action_connection
         self.send_process = send_process
 
-        self.ecs = EntityComponentSystem(self.on_create, self.on_remove)
+        self.ecs = EntityComponentSystem(self.on_create, self.on_remove, columnar=config.world.columnar_positions,
+                                         on_sync=self.on_sync, on_change=self.on_change,
+                                         on_remove_requested=self.drop_chase_targets)
         self.local_action_sender = ClientActionSender(self.write_local_action)
         self.local_player = players[-1]
 
@@ -129,38 +84,39 @@ class ServerGameMenu(UIElement):
         self.received_actions.append((-1, action))
 
     def on_create(self, entity_id, components: list[Component]):
-        components_to_exclude = (
-            DecayComponent,
-            EnemyFinderComponent,
-            ProjectileThrowComponent,
-            DamageOnContactComponent,
-            CloseRangeAttackComponent,
-            ReturnMeatOnDeathComponent,
-            MaxMeatIncreaseComponent,
-            WorkFinderComponent,
-            ResourceGathererComponent,
-            ResourceDepotComponent,
-        )
-        components = [component for component in components if type(component) not in components_to_exclude]
         self.game_composer.camera.check_if_fortress_appeared(self.ecs, self.local_player)
 
-        self.action_sender.send_entity(entity_id, components)
+    @classmethod
+    def _components_to_send(cls, components: list[Component]) -> list[Component]:
+        return [component for component in components if component_class_of(component) not in cls.COMPONENTS_TO_EXCLUDE]
+
+    def on_change(self, changes: list[tuple[EntityId, Component]]):
+        changes = [(entity_id, component) for entity_id, component in changes
+                   if component_class_of(component) not in self.COMPONENTS_TO_EXCLUDE]
+        if changes:
+            self.action_sender.update_components_info(changes)
+
+    def on_sync(self, created: list[tuple[EntityId, list[Component]]], removed: list[EntityId]):
+        if created:
+            self.action_sender.send_entities([(entity_id, self._components_to_send(components))
+                                              for entity_id, components in created])
+        if removed:
+            self.action_sender.remove_entities(removed)
 
     def is_defeated(self, player_id: int, entity_to_ignore: EntityId):
         if self.players[player_id].current_state != PlayerState.BATTLER:
             return False
 
-        for entity, (owner, _) in self.game_composer.ecs.get_entities_with_components((PlayerOwnerComponent, CoreBuildingComponent)):
-            if entity != entity_to_ignore and owner.socket_id == player_id:
-                return False
-        return True
+        owners = self.ecs.get_partition(PlayerOwnerComponent, 'socket_id')
+        return not owners.entities_with(player_id, CoreBuildingComponent) - {entity_to_ignore}
 
     def is_winner(self, player_id: int, entity_to_ignore: EntityId):
         if self.players[player_id].current_state != PlayerState.BATTLER:
             return False
 
-        for entity, (owner, _) in self.game_composer.ecs.get_entities_with_components((PlayerOwnerComponent, CoreBuildingComponent)):
-            if entity != entity_to_ignore and owner.socket_id != player_id:
+        owners = self.ecs.get_partition(PlayerOwnerComponent, 'socket_id')
+        for socket_id in owners.keys():
+            if socket_id != player_id and owners.entities_with(socket_id, CoreBuildingComponent) - {entity_to_ignore}:
                 return False
         return True
 
@@ -202,19 +158,17 @@ class ServerGameMenu(UIElement):
                 break
 
     def drop_chase_targets(self, entity_id: EntityId):
-        for chase_entity_id, (chase,) in self.game_composer.ecs.get_entities_with_components((ChaseComponent,)):
-            if chase.entity_id == entity_id:
-                chase.drop_target()
+        for chase_entity_id, chase in self.ecs.get_relation(ChaseComponent, 'entity_id').sources(entity_id):
+            chase.drop_target()
+            self.ecs.mark_changed(chase_entity_id, chase)
 
     def on_remove(self, entity_id: EntityId):
         self.game_composer.produce_menu.on_death(entity_id)
         self.game_composer.unit_move_menu.on_death(entity_id)
 
-        self.drop_chase_targets(entity_id)
+        self.drop_chase_targets(entity_id)  # цели, выбранные системами уже после запроса удаления
         self.check_for_game_over_on_death(entity_id)
 
-        self.action_sender.remove_entity(entity_id)
-
     def on_update(self):
         while self.received_actions:
             sender, (command, *args) = self.received_actions.pop(0)
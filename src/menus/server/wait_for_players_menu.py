@@ -112,7 +112,9 @@ class WaitForPlayersMenu(UIElement):
             if player.socket_id == HOST_PLAYER_ID:
                 continue
 
-            self.write_action_connection.send((['start', player.socket_id, players], player.socket_id))
+            # клиенты строят навигацию по тем же границам мира, что и хост, иначе пути разойдутся
+            self.write_action_connection.send((['start', player.socket_id, players, config.world.size],
+                                               player.socket_id))
 
         set_main_element(
             ServerGameMenu(self.socket, self.connections, self.received_actions, self.write_action_connection,
@@ -15,6 +15,7 @@ from src.server.action_sender import ServerActionSender
 from src.utils.collision import can_be_placed
 from src.utils.image import get_image
 from src.utils.math_utils import spread_position
+from src.utils.unique_id import entity_id_from_wire
 
 
 class ServerActionHandler:
@@ -27,11 +28,11 @@ class ServerActionHandler:
         player = self.players[socket_id]
 
         if command == ServerCommands.PRODUCE_UNIT:
-            self.handle_produce(player, args[0], args[1])
+            self.handle_produce(player, entity_id_from_wire(args[0]), args[1])
         elif command == ServerCommands.PLACE_UNIT:
             self.handle_place(player, args[0], args[1], args[2])
         elif command == ServerCommands.SET_TARGET_MOVE:
-            self.handle_force_move(player, args[0], tuple(args[1]))
+            self.handle_force_move(player, [entity_id_from_wire(wire_id) for wire_id in args[0]], tuple(args[1]))
 
         else:
             print(f'Unknown command: {command}({args})')
@@ -53,7 +54,7 @@ class ServerActionHandler:
 
         if producing_component.add_to_queue(unit_name, player):
             self.action_sender.update_resource_info(player)
-            self.action_sender.update_component_info(build_entity_id, producing_component)
+            self.ecs.mark_changed(build_entity_id, producing_component)
 
     def handle_place(self, player: PlayerInfo, build_name: str, position_x: float, position_y: float):
         if player.current_state == PlayerState.SPECTATOR:
@@ -105,5 +106,6 @@ class ServerActionHandler:
 
             chase.chase_position = PositionComponent(*spread_position(position, 50))
             chase.entity_id = None
+            chase.path_goal = tuple(position)
 
-            self.action_sender.update_component_info(entity_id, chase)
+            self.ecs.mark_changed(entity_id, chase)
@@ -5,11 +5,12 @@ from typing import Any
 from src.components.base.position import PositionComponent
 from src.constants import ClientCommands, SoundCode
 from src.core.camera import Camera
-from src.core.types import Component, EntityId
+from src.core.types import Component, EntityId, component_class_of
 from src.core.types import PlayerInfo
 from src.elements.damage_indicators import DamageIndicators
 from src.sound_player import play_sound
 from src.utils.sound_volume import get_sound_volume_from_distance
+from src.utils.unique_id import entity_id_to_wire
 
 
 class ServerActionSender:
@@ -24,19 +25,28 @@ class ServerActionSender:
             return
         self.write_action_connection.send((command, player_id))
 
-    def send_entity(self, entity_id: EntityId, components: list[Component]) -> None:
-        """Оправить сущность для её появления у игроков"""
-        self.send([ClientCommands.CREATE, {
-            'entity_id': entity_id,
+    @staticmethod
+    def _entity_json(entity_id: EntityId, components: list[Component]) -> dict:
+        return {
+            'entity_id': entity_id_to_wire(entity_id),
             'components': [
-                dataclasses.asdict(component) | {'component_class': component.__class__.__name__}
+                dataclasses.asdict(component) | {'component_class': component_class_of(component).__name__}
                 for component in components]
-        }])
+        }
+
+    def send_entity(self, entity_id: EntityId, components: list[Component]) -> None:
+        """Оправить сущность для её появления у игроков"""
+        self.send([ClientCommands.CREATE, self._entity_json(entity_id, components)])
+
+    def send_entities(self, entities: list[tuple[EntityId, list[Component]]]) -> None:
+        """Оправить все созданные за тик сущности одним сообщением"""
+        self.send([ClientCommands.CREATE_BATCH,
+                   [self._entity_json(entity_id, components) for entity_id, components in entities]])
 
     def sync_entity(self, entity_id: EntityId, components: list[Component]) -> None:
         """Синхронизовать сущность у игроков"""
         self.send([ClientCommands.UPDATE, {
-            'entity_id': entity_id,
+            'entity_id': entity_id_to_wire(entity_id),
             'components': [
                 dataclasses.asdict(component)
                 for component in components]
@@ -47,10 +57,19 @@ class ServerActionSender:
 
     def update_component_info(self, entity_id: EntityId, component: Component) -> None:
         self.send([ClientCommands.COMPONENT_INFO,
-                   entity_id, component.__class__.__name__, dataclasses.asdict(component)])
+                   entity_id_to_wire(entity_id), component_class_of(component).__name__, dataclasses.asdict(component)])
+
+    def update_components_info(self, changes: list[tuple[EntityId, Component]]) -> None:
+        """Оправить все изменённые за тик компоненты одним сообщением"""
+        self.send([ClientCommands.COMPONENT_INFO_BATCH, [
+            [entity_id_to_wire(entity_id), component_class_of(component).__name__, dataclasses.asdict(component)]
+            for entity_id, component in changes]])
 
     def remove_entity(self, entity_id: EntityId):
-        self.send([ClientCommands.DEAD, entity_id])
+        self.send([ClientCommands.DEAD, entity_id_to_wire(entity_id)])
+
+    def remove_entities(self, entity_ids: list[EntityId]):
+        self.send([ClientCommands.DEAD_BATCH, [entity_id_to_wire(entity_id) for entity_id in entity_ids]])
 
     def show_popup(self, label: str, position: PositionComponent, color: str):
         self.send([ClientCommands.POPUP, label, position.x, position.y, color])
@@ -0,0 +1,101 @@
+from src.components.base.collider import ColliderComponent
+from src.components.base.decay import DecayComponent
+from src.components.base.player_owner import PlayerOwnerComponent
+from src.components.base.position import PositionComponent
+from src.components.base.texture import TextureComponent
+from src.components.base.velocity import VelocityComponent
+from src.components.chase import ChaseComponent
+from src.components.core_building import CoreBuildingComponent
+from src.components.fighting.close_range_attack import CloseRangeAttackComponent
+from src.components.fighting.damage_on_contact import DamageOnContactComponent
+from src.components.fighting.enemy_finder import EnemyFinderComponent
+from src.components.fighting.health import HealthComponent
+from src.components.fighting.projectile_throw import ProjectileThrowComponent
+from src.components.meat import ReturnMeatOnDeathComponent, MaxMeatIncreaseComponent
+from src.components.minimap_icon import MinimapIconComponent
+from src.components.unit_production import UnitProductionComponent
+from src.components.worker.depot import ResourceDepotComponent
+from src.components.worker.resource import ResourceComponent
+from src.components.worker.resource_gatherer import ResourceGathererComponent
+from src.components.worker.uncompleted_building import UncompletedBuildingComponent
+from src.components.worker.work_finder import WorkFinderComponent
+from src.config import config
+from src.core.bounding_boxes import init_bounding_boxes
+from src.core.entity_component_system import EntityComponentSystem
+from src.core.navigation import NavigationGrid
+from src.core.occupancy_grid import OccupancyGrid
+from src.core.types import PlayerInfo
+from src.server.action_sender import ServerActionSender
+from src.systems.base.colliders import collider_system, init_collider_broad_phase
+from src.systems.base.death import death_system
+from src.systems.base.decay import decay_system
+from src.systems.base.separation import separation_system
+from src.systems.base.velocity import velocity_system, columnar_velocity_system
+from src.systems.chase import chase_system
+from src.systems.fighting.close_range_attack import close_range_attack_system
+from src.systems.fighting.damage_on_contact import damage_on_contact_system
+from src.systems.fighting.enemy_finder import enemy_finder_system
+from src.systems.fighting.projectile_throw import projectile_throw_system
+from src.systems.max_meat_increase import max_meat_increase_system
+from src.systems.unit_production import unit_production_system
+from src.systems.worker.building_completion import building_completion_system
+from src.systems.worker.resource_gathering import working_system
+from src.systems.worker.work_finder import work_finder_system
+from src.utils.collision import is_static_footprint
+
+
+def init_server_ecs(ecs: EntityComponentSystem, action_sender: ServerActionSender,
+                    players: dict[int, PlayerInfo]):
+    ecs.add_variable('action_sender', action_sender)
+    ecs.add_variable('players', players)
+
+    ecs.init_component(PositionComponent)
+    ecs.init_component(VelocityComponent)
+    ecs.init_component(DecayComponent)
+    ecs.init_component(TextureComponent)
+    ecs.init_component(MinimapIconComponent)
+    ecs.init_component(UnitProductionComponent)
+    ecs.init_component(PlayerOwnerComponent)
+    ecs.init_component(ChaseComponent)
+    ecs.init_component(EnemyFinderComponent)
+    ecs.init_component(HealthComponent)
+    ecs.init_component(ProjectileThrowComponent)
+    ecs.init_component(DamageOnContactComponent)
+    ecs.init_component(CloseRangeAttackComponent)
+    ecs.init_component(ReturnMeatOnDeathComponent)
+    ecs.init_component(MaxMeatIncreaseComponent)
+    ecs.init_component(WorkFinderComponent)
+    ecs.init_component(ResourceComponent)
+    ecs.init_component(ResourceDepotComponent)
+    ecs.init_component(ResourceGathererComponent)
+    ecs.init_component(UncompletedBuildingComponent)
+    ecs.init_component(ColliderComponent)
+    ecs.init_component(CoreBuildingComponent)
+
+    ecs.init_relation(ChaseComponent, 'entity_id')
+    ecs.init_partition(PlayerOwnerComponent, 'socket_id')
+    ecs.init_spatial_hash((HealthComponent, PlayerOwnerComponent))
+    ecs.init_spatial_hash((ResourceComponent,))
+    init_collider_broad_phase(ecs)
+    init_bounding_boxes(ecs)
+    ecs.add_variable('occupancy_grid', ecs.add_index(OccupancyGrid(is_static_footprint)))
+    ecs.add_variable('navigation', ecs.add_index(NavigationGrid(config.world.size)))
+
+    ecs.init_batch_system(decay_system)
+    ecs.init_system(unit_production_system)
+    ecs.init_system(max_meat_increase_system)
+    if ecs.columnar_store is None:
+        ecs.init_system(velocity_system)
+    else:
+        ecs.init_batch_system(columnar_velocity_system)
+    ecs.init_batch_system(chase_system)
+    ecs.init_system(enemy_finder_system)
+    ecs.init_batch_system(projectile_throw_system)
+    ecs.init_system(damage_on_contact_system)
+    ecs.init_batch_system(close_range_attack_system)
+    ecs.init_system(death_system)
+    ecs.init_system(work_finder_system)
+    ecs.init_system(working_system)
+    ecs.init_system(building_completion_system)
+    ecs.init_batch_system(separation_system)
+    ecs.init_system(collider_system)
@@ -1,9 +1,12 @@
 import math
+from typing import Type
 
 from src.components.base.collider import ColliderComponent
 from src.components.base.position import PositionComponent
 from src.components.base.texture import TextureComponent
 from src.core.entity_component_system import EntityComponentSystem
+from src.core.indexes import EntityIndex
+from src.core.types import EntityId, Component
 from src.utils.math_utils import convert_to_main_angle
 
 ticks_to_update = 3
@@ -12,28 +15,61 @@ ticks = 0
 angle_neighborhood = 60
 
 
+class DynamicColliderRadius(EntityIndex):
+    """Наибольший радиус подвижного коллайдера, только растёт. На него расширяется поиск вокруг статичного"""
+
+    def __init__(self):
+        self.max_radius = 0
+
+    def _update(self, collider: ColliderComponent | None) -> None:
+        if collider is not None and not collider.static:
+            self.max_radius = max(self.max_radius, collider.radius)
+
+    def on_entity_created(self, entity_id: EntityId, components: dict[Type[Component], Component]) -> None:
+        self._update(components.get(ColliderComponent))
+
+    def on_component_changed(self, entity_id: EntityId, component: Component) -> None:
+        if isinstance(component, ColliderComponent):
+            self._update(component)
+
+
+def init_collider_broad_phase(ecs: EntityComponentSystem) -> None:
+    ecs.init_spatial_hash((ColliderComponent, TextureComponent), cell_size=32)
+    ecs.add_variable('dynamic_colliders', ecs.add_index(DynamicColliderRadius()))
+
+
+def push_out(position: PositionComponent, collider: ColliderComponent,
+             entity_position: PositionComponent, entity_collider: ColliderComponent,
+             entity_texture: TextureComponent) -> None:
+    distance = position.distance(entity_position)
+    if distance >= (collider.radius + entity_collider.radius):
+        return
+
+    angle = position.angle_between(entity_position)
+    angle_diff = convert_to_main_angle(angle - entity_texture.rotation_angle)
+
+    if 180 - angle_neighborhood <= angle_diff <= 180:
+        angle -= 1
+    elif 180 < angle_diff <= 180 + angle_neighborhood:
+        angle += 1
+
+    entity_position.x = position.x + math.cos(math.radians(angle)) * (collider.radius + entity_collider.radius)
+    entity_position.y = position.y - math.sin(math.radians(angle)) * (collider.radius + entity_collider.radius)
+
+
 def collider_system(collider: ColliderComponent, position: PositionComponent,
-                    ecs: EntityComponentSystem):
+                    ecs: EntityComponentSystem, dynamic_colliders: DynamicColliderRadius):
+    """Сетка отбирает только тех, кто ближе суммы радиусов, остальное делает push_out"""
     if not collider.static:
         return
 
-    for _, (entity_position, entity_collider, entity_texture) in ecs.get_entities_with_components((PositionComponent,
-                                                                                                   ColliderComponent,
-                                                                                                   TextureComponent)):
+    candidates = ecs.get_spatial_hash((ColliderComponent, TextureComponent)).query_radius(
+        position.x, position.y, collider.radius + dynamic_colliders.max_radius)
+    for entity_id in candidates:
+        entity_position, entity_collider, entity_texture = ecs.get_components(entity_id, (PositionComponent,
+                                                                                           ColliderComponent,
+                                                                                           TextureComponent))
         if entity_collider.static:
             continue
 
-        distance = position.distance(entity_position)
-        if distance >= (collider.radius + entity_collider.radius):
-            continue
-
-        angle = position.angle_between(entity_position)
-        angle_diff = convert_to_main_angle(angle - entity_texture.rotation_angle)
-
-        if 180 - angle_neighborhood <= angle_diff <= 180:
-            angle -= 1
-        elif 180 < angle_diff <= 180 + angle_neighborhood:
-            angle += 1
-
-        entity_position.x = position.x + math.cos(math.radians(angle)) * (collider.radius + entity_collider.radius)
-        entity_position.y = position.y - math.sin(math.radians(angle)) * (collider.radius + entity_collider.radius)
+        push_out(position, collider, entity_position, entity_collider, entity_texture)
@@ -34,12 +34,9 @@ def death_system(entity_id: EntityId, health: HealthComponent, action_sender: Se
     if health.amount > 0:
         return
 
-    for angry_entity_id, (chase,) in ecs.get_entities_with_components((ChaseComponent,)):
-        if chase.entity_id != entity_id:
-            continue
-
+    for angry_entity_id, chase in ecs.get_relation(ChaseComponent, 'entity_id').sources(entity_id):
         chase.drop_target()
-        action_sender.update_component_info(angry_entity_id, chase)
+        ecs.mark_changed(angry_entity_id, chase)
 
     bring_meat_back(entity_id, action_sender, ecs, players)
 
@@ -1,13 +1,17 @@
+from typing import Sequence
+
 from typing_extensions import TYPE_CHECKING
 
 from src.components.base.decay import DecayComponent
+from src.core.types import EntityId
 
 if TYPE_CHECKING:
     from src.core.entity_component_system import EntityComponentSystem
 
 
-def decay_system(entity_id: str, decay: DecayComponent, ecs: 'EntityComponentSystem'):
-    if decay.frames_till_decay > 0:
-        decay.frames_till_decay -= 1
-    else:
-        ecs.remove_entity(entity_id)
+def decay_system(entity_ids: Sequence[EntityId], decays: Sequence[DecayComponent], ecs: 'EntityComponentSystem'):
+    for entity_id, decay in zip(entity_ids, decays):
+        if decay.frames_till_decay > 0:
+            decay.frames_till_decay -= 1
+        else:
+            ecs.remove_entity(entity_id)
@@ -0,0 +1,94 @@
+import math
+from typing import Sequence
+
+from src.components.base.collider import ColliderComponent
+from src.components.base.position import PositionComponent
+from src.components.base.texture import TextureComponent
+from src.core.entity_component_system import EntityComponentSystem
+from src.core.types import EntityId
+from src.systems.base.colliders import DynamicColliderRadius
+
+SEPARATION_STRENGTH = 0.5  # какая доля перекрытия двух юнитов убирается за тик
+
+
+def separation_system(entity_ids: Sequence[EntityId],
+                      positions: Sequence[PositionComponent],
+                      colliders: Sequence[ColliderComponent],
+                      ecs: EntityComponentSystem,
+                      dynamic_colliders: DynamicColliderRadius):
+    """
+    Раздвигает пересекающиеся подвижные юниты. Соседей даёт сетка коллайдеров, каждая пара смотрится один раз.
+    Сдвиги копятся по id и применяются после обхода, поэтому результат не зависит от того,
+    как сущности разложены по архетипам: на клиенте их меньше, чем на сервере
+    """
+    grid = ecs.get_spatial_hash((ColliderComponent, TextureComponent))
+    grid.invalidate()  # юниты уже сдвинулись в этом тике
+
+    bodies = {entity_id: (position, collider)
+              for entity_id, position, collider in zip(entity_ids, positions, colliders) if not collider.static}
+    shifts: dict[EntityId, list[float]] = {}
+    for entity_id in sorted(bodies):
+        position, collider = bodies[entity_id]
+        for other_id in sorted(grid.query_radius(position.x, position.y,
+                                                 collider.radius + dynamic_colliders.max_radius)):
+            if other_id <= entity_id:
+                continue
+            other = bodies.get(other_id)
+            if other is None:
+                continue
+
+            other_position, other_collider = other
+            min_distance = collider.radius + other_collider.radius
+            offset_x, offset_y = other_position.x - position.x, other_position.y - position.y
+            distance = math.hypot(offset_x, offset_y)
+            if distance >= min_distance:
+                continue
+            if distance == 0:
+                # юниты в одной точке расходятся в сторону, зависящую только от id, одинаково на сервере и клиенте
+                offset_x, offset_y, distance = math.cos(other_id), math.sin(other_id), 1
+
+            push = (min_distance - distance) * SEPARATION_STRENGTH / 2 / distance
+            shift = shifts.setdefault(entity_id, [0.0, 0.0])
+            shift[0] -= offset_x * push
+            shift[1] -= offset_y * push
+            other_shift = shifts.setdefault(other_id, [0.0, 0.0])
+            other_shift[0] += offset_x * push
+            other_shift[1] += offset_y * push
+
+    for entity_id in sorted(shifts):
+        position = bodies[entity_id][0]
+        position.x += shifts[entity_id][0]
+        position.y += shifts[entity_id][1]
+
+
+def test():
+    from src.components.test import BComponent
+    from src.systems.base.colliders import init_collider_broad_phase
+
+    def simulate(split_archetypes: bool) -> list[tuple[float, float]]:
+        ecs = EntityComponentSystem()
+        for component_class in (PositionComponent, ColliderComponent, TextureComponent, BComponent):
+            ecs.init_component(component_class)
+        init_collider_broad_phase(ecs)
+        ecs.init_batch_system(separation_system)
+
+        entity_ids = []
+        for i, (x, y) in enumerate([(0, 0), (5, -3), (3, 4), (-2, 1)]):
+            components = [PositionComponent(x, y), ColliderComponent(10),
+                          TextureComponent.create_from_filepath('assets/unit/archer/arrow.png')]
+            if split_archetypes and i % 2:
+                components.append(BComponent(1))
+            entity_ids.append(ecs.create_entity(components))
+        ecs.update()
+        return [ecs.get_component(entity_id, PositionComponent).to_tuple() for entity_id in entity_ids]
+
+    # на сервере юниты лежат в разных архетипах, на клиенте в одном, сдвиги должны совпасть
+    assert simulate(split_archetypes=False) == simulate(split_archetypes=True)
+
+
+if __name__ == '__main__':
+    import pygame
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    test()
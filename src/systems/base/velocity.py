@@ -1,7 +1,17 @@
+from typing import TYPE_CHECKING
+
 from src.components.base.position import PositionComponent
 from src.components.base.velocity import VelocityComponent
 
+if TYPE_CHECKING:
+    from src.core.columnar_store import ColumnarStore
+
 
 def velocity_system(velocity: VelocityComponent, position: PositionComponent):
     position.x += velocity.speed_x
     position.y += velocity.speed_y
+
+
+def columnar_velocity_system(columnar_store: 'ColumnarStore'):
+    """Пакетная система: двигает сразу все сущности из ColumnarStore одной операцией над массивами"""
+    columnar_store.integrate_velocities()
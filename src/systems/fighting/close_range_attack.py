@@ -1,39 +1,38 @@
+from typing import Sequence
+
 from src.components.base.collider import ColliderComponent
-from src.components.base.player_owner import PlayerOwnerComponent
 from src.components.base.position import PositionComponent
 from src.components.chase import ChaseComponent
 from src.components.fighting.close_range_attack import CloseRangeAttackComponent
 from src.components.fighting.health import HealthComponent
 from src.constants import SoundCode
 from src.core.entity_component_system import EntityComponentSystem
-from src.core.types import EntityId
 from src.server.action_sender import ServerActionSender
 from src.utils.collision import is_close_to_target
 
 
-def close_range_attack_system(entity_id: EntityId,
-                              close_range_attack: CloseRangeAttackComponent,
-                              owner: PlayerOwnerComponent,
-                              position: PositionComponent,
+def close_range_attack_system(close_range_attacks: Sequence[CloseRangeAttackComponent],
+                              positions: Sequence[PositionComponent],
                               ecs: EntityComponentSystem,
-                              chase: ChaseComponent,
-                              collider: ColliderComponent,
+                              chases: Sequence[ChaseComponent],
+                              colliders: Sequence[ColliderComponent],
                               action_sender: ServerActionSender):
-    if chase.entity_id is None:
-        return
+    for close_range_attack, position, chase, collider in zip(close_range_attacks, positions, chases, colliders):
+        if chase.entity_id is None:
+            continue
 
-    if not is_close_to_target(ecs, chase, collider, position):
-        return
+        if not is_close_to_target(ecs, chase, collider, position):
+            continue
 
-    if close_range_attack.current_delay < close_range_attack.delay:
-        close_range_attack.current_delay += 1
-        return
+        if close_range_attack.current_delay < close_range_attack.delay:
+            close_range_attack.current_delay += 1
+            continue
 
-    close_range_attack.current_delay = 0
+        close_range_attack.current_delay = 0
 
-    enemy_health, = ecs.get_components(chase.entity_id, (HealthComponent,))
+        enemy_health, = ecs.get_components(chase.entity_id, (HealthComponent,))
 
-    enemy_health.apply_damage(close_range_attack.damage)
-    action_sender.update_component_info(chase.entity_id, enemy_health)
-    action_sender.show_popup(str(close_range_attack.damage), chase.chase_position, 'red')
-    action_sender.play_sound(SoundCode.SWORD_SLASH, position.to_tuple())
+        enemy_health.apply_damage(close_range_attack.damage)
+        ecs.mark_changed(chase.entity_id, enemy_health)
+        action_sender.show_popup(str(close_range_attack.damage), chase.chase_position, 'red')
+        action_sender.play_sound(SoundCode.SWORD_SLASH, position.to_tuple())
@@ -1,44 +1,45 @@
 from src.components.base.player_owner import PlayerOwnerComponent
 from src.components.base.position import PositionComponent
-from src.components.base.texture import TextureComponent
 from src.components.fighting.damage_on_contact import DamageOnContactComponent
 from src.components.fighting.health import HealthComponent
 from src.constants import SoundCode
+from src.core.bounding_boxes import BoundingBoxes
 from src.core.entity_component_system import EntityComponentSystem
 from src.core.types import EntityId
 from src.server.action_sender import ServerActionSender
 
-DELAY_BETWEEN_CHECKS = 10
-
 
 def damage_on_contact_system(entity_id: EntityId,
                              damage_on_contact: DamageOnContactComponent,
                              owner: PlayerOwnerComponent,
                              position: PositionComponent,
                              ecs: EntityComponentSystem,
-                             texture: TextureComponent,
+                             bounding_boxes: BoundingBoxes,
                              action_sender: ServerActionSender
                              ):
-    damage_on_contact.check_delay += 1
-    if damage_on_contact.check_delay < DELAY_BETWEEN_CHECKS:
+    """Проверяет попадание каждый тик, но только по врагам из соседних ячеек сетки"""
+    if damage_on_contact.current_delay:
+        damage_on_contact.current_delay -= 1
         return
 
-    damage_on_contact.check_delay = 0
-    for enemy_id, (enemy_health, enemy_owner, enemy_position, enemy_texture) in ecs.get_entities_with_components(
-            (HealthComponent, PlayerOwnerComponent, PositionComponent, TextureComponent)):
+    rect = bounding_boxes.get(entity_id, position)
+    if rect is None:
+        return
 
+    search_radius = bounding_boxes.half_diagonal(entity_id) + bounding_boxes.max_half_diagonal + 1
+    for enemy_id in ecs.get_spatial_hash((HealthComponent, PlayerOwnerComponent)).query_radius(
+            position.x, position.y, search_radius):
+        enemy_health, enemy_owner, enemy_position = ecs.get_components(
+            enemy_id, (HealthComponent, PlayerOwnerComponent, PositionComponent))
         if enemy_owner == owner:
             continue
 
-        rect = texture.texture.get_rect()
-        rect.center = position.to_tuple()
-        enemy_rect = enemy_texture.texture.get_rect()
-        enemy_rect.center = enemy_position.to_tuple()
-        if not enemy_rect.colliderect(rect):
+        enemy_rect = bounding_boxes.get(enemy_id, enemy_position)
+        if enemy_rect is None or not enemy_rect.colliderect(rect):
             continue
 
         enemy_health.apply_damage(damage_on_contact.damage)
-        action_sender.update_component_info(enemy_id, enemy_health)
+        ecs.mark_changed(enemy_id, enemy_health)
         action_sender.show_popup(str(damage_on_contact.damage), enemy_position, 'red')
 
         if damage_on_contact.die_on_contact:
@@ -46,3 +47,5 @@ def damage_on_contact_system(entity_id: EntityId,
             action_sender.play_sound(SoundCode.ARROW_CONTACT, position.to_tuple())
 
             return
+
+        damage_on_contact.current_delay = damage_on_contact.repeat_delay
@@ -5,12 +5,11 @@ from src.components.fighting.enemy_finder import EnemyFinderComponent
 from src.components.fighting.health import HealthComponent
 from src.core.entity_component_system import EntityComponentSystem
 from src.core.types import EntityId
-from src.server.action_sender import ServerActionSender
 
-DELAY_BETWEEN_ATTEMPTS = 60
+DELAY_BETWEEN_ATTEMPTS = 60  # после неудачного поиска юнит ждёт столько тиков, свободный юнит ищет каждый тик
 
 
-def enemy_finder_system(entity_id: EntityId, ecs: EntityComponentSystem, action_sender: ServerActionSender,
+def enemy_finder_system(entity_id: EntityId, ecs: EntityComponentSystem,
                         position: PositionComponent,
                         owner: PlayerOwnerComponent,
                         chase: ChaseComponent,
@@ -23,24 +22,16 @@ def enemy_finder_system(entity_id: EntityId, ecs: EntityComponentSystem, action_
     if chase.chase_position is not None:
         return
 
-    nearest = min(
-        ((other_entity_id, (other_position, other_owner))
-         for other_entity_id, (other_position, other_owner, _) in
-         ecs.get_entities_with_components((PositionComponent,
-                                           PlayerOwnerComponent,
-                                           HealthComponent))
-         if owner.socket_id != other_owner.socket_id),
-        key=lambda entity: position.distance(entity[1][0]),
-        default=None)
-    if nearest is None:
-        return
-
-    other_entity_id, (other_position, other_owner) = nearest
-
-    if other_position.distance(position) > enemy_finder.anger_range:
+    own_entities = ecs.get_partition(PlayerOwnerComponent, 'socket_id').entities(owner.socket_id)
+    other_entity_id = ecs.get_spatial_hash((HealthComponent, PlayerOwnerComponent)).nearest(
+        position.x, position.y, enemy_finder.anger_range,
+        filter=lambda candidate_id: candidate_id not in own_entities)
+    if other_entity_id is None:
         enemy_finder.delay = DELAY_BETWEEN_ATTEMPTS
         return
 
+    other_position = ecs.get_component(other_entity_id, PositionComponent)
+
     chase.entity_id = other_entity_id
     chase.chase_position = other_position
-    action_sender.update_component_info(entity_id, chase)
+    ecs.mark_changed(entity_id, chase)
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from src.components.base.collider import ColliderComponent
 from src.components.base.player_owner import PlayerOwnerComponent
 from src.components.base.position import PositionComponent
@@ -11,27 +13,29 @@ from src.server.action_sender import ServerActionSender
 from src.utils.collision import is_close_to_target
 
 
-def projectile_throw_system(projectile_throw: ProjectileThrowComponent, position: PositionComponent,
-                            chase: ChaseComponent,
-                            texture: TextureComponent,
+def projectile_throw_system(projectile_throws: Sequence[ProjectileThrowComponent],
+                            positions: Sequence[PositionComponent],
+                            chases: Sequence[ChaseComponent],
+                            textures: Sequence[TextureComponent],
                             ecs: EntityComponentSystem,
-                            collider: ColliderComponent,
-                            owner: PlayerOwnerComponent,
+                            colliders: Sequence[ColliderComponent],
+                            owners: Sequence[PlayerOwnerComponent],
                             action_sender: ServerActionSender):
-    if chase.entity_id is None:
-        return
-
-    if not is_close_to_target(ecs, chase, collider, position):
-        return
+    for projectile_throw, position, chase, texture, collider, owner in zip(projectile_throws, positions, chases,
+                                                                           textures, colliders, owners):
+        if chase.entity_id is None:
+            continue
 
-    if projectile_throw.current_delay < projectile_throw.delay:
-        projectile_throw.current_delay += 1
-        return
+        if not is_close_to_target(ecs, chase, collider, position):
+            continue
 
-    projectile_throw.current_delay = 0
+        if projectile_throw.current_delay < projectile_throw.delay:
+            projectile_throw.current_delay += 1
+            continue
 
-    ecs.create_entity(projectiles[projectile_throw.projectile_name](position.x, position.y,
-                                                                    owner, texture.rotation_angle,
-                                                                    projectile_throw.arrow_speed))
-    action_sender.play_sound(SoundCode.ARROW_THROW, position.to_tuple())
+        projectile_throw.current_delay = 0
 
+        ecs.create_entity(projectiles[projectile_throw.projectile_name](position.x, position.y,
+                                                                        owner, texture.rotation_angle,
+                                                                        projectile_throw.arrow_speed))
+        action_sender.play_sound(SoundCode.ARROW_THROW, position.to_tuple())
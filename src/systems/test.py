@@ -1,13 +1,20 @@
+from typing import Sequence
+
 from src.components.test import BComponent, CComponent
+from src.core.types import EntityId
 
 
-def test_a_system(entity_id: str, a: int):
+def test_a_system(entity_id: EntityId, a: int):
     print('test_a_system', entity_id, a)
 
 
-def test_b_system(entity_id: str, b: BComponent):
+def test_b_system(entity_id: EntityId, b: BComponent):
     print('test_b_system', entity_id, b.value)
 
 
-def test_bc_system(entity_id: str, b: BComponent, c: CComponent, a: int):
+def test_bc_system(entity_id: EntityId, b: BComponent, c: CComponent, a: int):
     print('test_bc_system', entity_id, b.value, c.value, a)
+
+
+def test_b_batch_system(entity_ids: Sequence[EntityId], bs: Sequence[BComponent], a: int):
+    print('test_b_batch_system', list(entity_ids), [b.value for b in bs], a)
@@ -7,11 +7,10 @@ from src.components.unit_production import UnitProductionComponent
 from src.core.entity_component_system import EntityComponentSystem
 from src.core.types import EntityId
 from src.entities import unit_production_factories
-from src.server.action_sender import ServerActionSender
 
 
 def unit_production_system(entity_id: EntityId, unit_prod: UnitProductionComponent, position: PositionComponent, ecs: EntityComponentSystem,
-                           player_owner: PlayerOwnerComponent, action_sender: ServerActionSender):
+                           player_owner: PlayerOwnerComponent):
     if not unit_prod.unit_queue:
         return
 
@@ -25,6 +24,6 @@ def unit_production_system(entity_id: EntityId, unit_prod: UnitProductionCompone
                                                         y=position.y + random.randint(-150, 150),
                                                         player_owner=player_owner)
     entity.append(ReturnMeatOnDeathComponent(unit_prod.producible_units[unit_to_produce].meat))
-    action_sender.update_component_info(entity_id, unit_prod)
+    ecs.mark_changed(entity_id, unit_prod)
     ecs.create_entity(entity)
     print(entity)
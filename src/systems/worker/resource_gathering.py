@@ -40,10 +40,11 @@ def working_system(entity_id: EntityId,
 
     if uncompleted_building is not None:
         uncompleted_building.progress += 1
-        action_sender.update_component_info(chase.entity_id, uncompleted_building)
+        ecs.mark_changed(chase.entity_id, uncompleted_building)
 
         if uncompleted_building.progress >= uncompleted_building.required_progress:
             chase.drop_target()
+            ecs.mark_changed(entity_id, chase)
 
     elif resource_source is not None:
         taken_wood = min(resource_gatherer.gathering_speed, resource_source.wood)
@@ -63,16 +64,13 @@ def working_system(entity_id: EntityId,
         if resource_source.money == 0 and resource_source.wood == 0:
             ecs.remove_entity(chase.entity_id)
             chase.drop_target()
+            ecs.mark_changed(entity_id, chase)
 
         if resource_gatherer.is_backpack_full:
+            depot_ids = ecs.get_partition(PlayerOwnerComponent, 'socket_id').entities_with(owner.socket_id,
+                                                                                         ResourceDepotComponent)
             nearest_depot = min(
-                ((other_entity_id, (other_position,))
-                 for other_entity_id, (other_position, other_owner, _) in
-                 ecs.get_entities_with_components((PositionComponent,
-                                                   PlayerOwnerComponent,
-                                                   ResourceDepotComponent)
-                                                  )
-                 if owner.socket_id == other_owner.socket_id),
+                ((depot_id, ecs.get_components(depot_id, (PositionComponent,))) for depot_id in depot_ids),
                 key=lambda entity: position.distance(entity[1][0]),
                 default=None)
 
@@ -83,7 +81,7 @@ def working_system(entity_id: EntityId,
             depot_entity_id, (depot_position,) = nearest_depot
             chase.entity_id = depot_entity_id
             chase.chase_position = depot_position
-            action_sender.update_component_info(entity_id, chase)
+            ecs.mark_changed(entity_id, chase)
 
         return
 
@@ -103,5 +101,7 @@ def working_system(entity_id: EntityId,
         action_sender.update_resource_info(player)
 
         chase.drop_target()
+        ecs.mark_changed(entity_id, chase)
     else:
         chase.drop_target()
+        ecs.mark_changed(entity_id, chase)
@@ -6,13 +6,11 @@ from src.components.worker.uncompleted_building import UncompletedBuildingCompon
 from src.components.worker.work_finder import WorkFinderComponent
 from src.core.entity_component_system import EntityComponentSystem
 from src.core.types import EntityId
-from src.server.action_sender import ServerActionSender
 
-DELAY_BETWEEN_ATTEMPTS = 60
+DELAY_BETWEEN_ATTEMPTS = 60  # после неудачного поиска рабочий ждёт столько тиков, свободный рабочий ищет каждый тик
 
 
 def work_finder_system(entity_id: EntityId, ecs: EntityComponentSystem,
-                       action_sender: ServerActionSender,
                        position: PositionComponent,
                        chase: ChaseComponent,
                        enemy_finder: WorkFinderComponent,
@@ -25,13 +23,17 @@ def work_finder_system(entity_id: EntityId, ecs: EntityComponentSystem,
     if chase.chase_position is not None:
         return
 
+    building_ids = ecs.get_partition(PlayerOwnerComponent, 'socket_id').entities_with(owner.socket_id,
+                                                                                    UncompletedBuildingComponent)
+    uncompleted_buildings = []
+    for building_entity_id in building_ids:
+        building_position, building_progress = ecs.get_components(building_entity_id,
+                                                                  (PositionComponent, UncompletedBuildingComponent))
+        if building_progress.progress < building_progress.required_progress:
+            uncompleted_buildings.append((building_entity_id, (building_position,)))
+
     nearest_uncompleted_building = min(
-        ((building_entity_id, (building_position,))
-         for building_entity_id, (building_position, building_progress, building_owner) in
-         ecs.get_entities_with_components((PositionComponent,
-                                           UncompletedBuildingComponent,
-                                           PlayerOwnerComponent))
-         if building_owner.socket_id == owner.socket_id and building_progress.progress < building_progress.required_progress),
+        uncompleted_buildings,
         key=lambda entity: position.distance(entity[1][0]),
         default=None)
     if nearest_uncompleted_building is not None:
@@ -39,22 +41,17 @@ def work_finder_system(entity_id: EntityId, ecs: EntityComponentSystem,
 
         chase.entity_id = building_entity_id
         chase.chase_position = building_position
-        action_sender.update_component_info(entity_id, chase)
+        ecs.mark_changed(entity_id, chase)
 
         return
 
-    nearest_resource = min(
-        ((other_entity_id, (other_position,))
-         for other_entity_id, (other_position, _) in
-         ecs.get_entities_with_components((PositionComponent,
-                                           ResourceComponent))),
-        key=lambda entity: position.distance(entity[1][0]),
-        default=None)
-    if nearest_resource is None:
+    other_entity_id = ecs.get_spatial_hash((ResourceComponent,)).nearest(position.x, position.y)
+    if other_entity_id is None:
+        enemy_finder.delay = DELAY_BETWEEN_ATTEMPTS
         return
 
-    other_entity_id, (other_position,) = nearest_resource
+    other_position = ecs.get_component(other_entity_id, PositionComponent)
 
     chase.entity_id = other_entity_id
     chase.chase_position = other_position
-    action_sender.update_component_info(entity_id, chase)
+    ecs.mark_changed(entity_id, chase)
@@ -7,6 +7,7 @@ from pygame.font import Font
 
 from src.ui import UIElement, UIAnchor, BorderParams
 from src.ui.types import PositionType
+from src.utils.text import render_text
 
 
 class TextLabel(UIElement):
@@ -26,7 +27,7 @@ class TextLabel(UIElement):
         self.text = text
         self.text_color = text_color
 
-        self.text_image = self.font.render(self.text, True, text_color)
+        self.text_image = render_text(self.font, self.text, text_color)
 
         size = self.text_image.get_size()
 
@@ -34,7 +35,7 @@ class TextLabel(UIElement):
                          border_params=border_params)
 
     def update_text(self):
-        self.text_image = self.font.render(self.text, True, self.text_color)
+        self.text_image = render_text(self.font, self.text, self.text_color)
         self._bounds.size = self.text_image.get_size()
         self._size = self.text_image.get_size()
 
@@ -44,8 +45,9 @@ class TextLabel(UIElement):
             self.update_text()
 
     def set_font(self, font: Font):
-        self.font = font
-        self.update_text()
+        if self.font is not font:
+            self.font = font
+            self.update_text()
 
     def set_text_color(self, color: Color):
         if self.text_color != color:
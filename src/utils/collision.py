@@ -1,15 +1,20 @@
+from typing import Type
+
 from pygame import Rect
 
 from src.components.base.collider import ColliderComponent
 from src.components.base.position import PositionComponent
 from src.components.base.texture import TextureComponent
 from src.components.chase import ChaseComponent
+from src.components.worker.resource import ResourceComponent
+from src.components.worker.uncompleted_building import UncompletedBuildingComponent
 from src.core.entity_component_system import EntityComponentSystem
+from src.core.types import Component
 
 
 def is_close_to_target(ecs: EntityComponentSystem,
                        chase: ChaseComponent, collider: ColliderComponent, position: PositionComponent):
-    if chase.entity_id not in ecs._entities:
+    if not ecs.has_entity(chase.entity_id):
         return False
 
     enemy_collider = ecs.get_component(chase.entity_id, ColliderComponent)
@@ -23,13 +28,15 @@ def is_close_to_target(ecs: EntityComponentSystem,
     return position.distance(chase.chase_position) <= distance
 
 
+def is_static_footprint(components: dict[Type[Component], Component]) -> bool:
+    """Здания, стройки, деревья и шахты: они не двигаются, поэтому лежат в OccupancyGrid"""
+    collider = components.get(ColliderComponent)
+    return (collider is not None and collider.static) \
+        or ResourceComponent in components or UncompletedBuildingComponent in components
+
+
 def can_be_placed(ecs: EntityComponentSystem, position: tuple[float, float], size: tuple[float, float]):
+    """Юниты не мешают постройке: их потом выталкивает collider_system"""
     place_position = Rect((0, 0), size)
     place_position.center = position
-    for _, (texture, entity_position) in ecs.get_entities_with_components((TextureComponent, PositionComponent)):
-        rect = texture.texture.get_rect()
-        rect.center = entity_position.to_tuple()
-
-        if rect.colliderect(place_position):
-            return False
-    return True
+    return ecs.get_variable('occupancy_grid').is_free(place_position)
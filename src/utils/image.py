@@ -1,7 +1,16 @@
+from collections import OrderedDict
+from typing import Iterable
+
 import pygame.image
+import pygame.transform
 
 cached_images = {}
 
+ROTATION_STEP = 2  # градусов, углы округляются до шага, чтобы на картинку было не больше 180 поворотов
+ROTATED_CACHE_BUDGET = 64 * 1024 * 1024  # байт пикселей повёрнутых картинок, сверх этого выкидываются давно не нужные
+cached_rotations: OrderedDict[tuple[str, int], pygame.Surface] = OrderedDict()
+cached_rotations_size = 0
+
 
 def get_image(filepath: str):
     if filepath in cached_images:
@@ -10,3 +19,36 @@ def get_image(filepath: str):
     image = pygame.image.load(filepath).convert_alpha()
     cached_images[filepath] = image
     return image
+
+
+def quantize_angle(angle: float) -> int:
+    return round(angle / ROTATION_STEP) * ROTATION_STEP % 360
+
+
+def get_rotated_image(filepath: str, angle: float) -> pygame.Surface:
+    """Картинка, повёрнутая на angle, округлённый до ROTATION_STEP. Повороты хранятся в LRU кэше"""
+    global cached_rotations_size
+
+    angle = quantize_angle(angle)
+    if angle == 0:
+        return get_image(filepath)
+
+    key = filepath, angle
+    image = cached_rotations.get(key)
+    if image is not None:
+        cached_rotations.move_to_end(key)
+        return image
+
+    image = cached_rotations[key] = pygame.transform.rotate(get_image(filepath), angle)
+    cached_rotations_size += image.get_width() * image.get_height() * image.get_bytesize()
+    while cached_rotations_size > ROTATED_CACHE_BUDGET and len(cached_rotations) > 1:
+        _, evicted = cached_rotations.popitem(last=False)
+        cached_rotations_size -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+    return image
+
+
+def prebake_rotations(filepaths: Iterable[str]) -> None:
+    """Заранее поворачивает картинки на все углы, чтобы не тратить на это первые кадры боя"""
+    for filepath in filepaths:
+        for angle in range(0, 360, ROTATION_STEP):
+            get_rotated_image(filepath, angle)
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+
+import pygame
+from pygame import Color, Surface
+from pygame.font import Font
+
+TEXT_CACHE_BUDGET = 16 * 1024 * 1024  # байт пикселей готовых надписей, сверх этого выкидываются давно не нужные
+cached_texts: OrderedDict[tuple, Surface] = OrderedDict()
+cached_texts_size = 0
+
+
+def _surface_size(surface: Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _get_cached(key: tuple) -> Surface | None:
+    surface = cached_texts.get(key)
+    if surface is not None:
+        cached_texts.move_to_end(key)
+    return surface
+
+
+def _put_cached(key: tuple, surface: Surface) -> Surface:
+    global cached_texts_size
+
+    cached_texts[key] = surface
+    cached_texts_size += _surface_size(surface)
+    while cached_texts_size > TEXT_CACHE_BUDGET and len(cached_texts) > 1:
+        _, evicted = cached_texts.popitem(last=False)
+        cached_texts_size -= _surface_size(evicted)
+    return surface
+
+
+def render_text(font: Font, text: str, color: Color, antialias: bool = True) -> Surface:
+    """font.render через общий LRU кэш. Картинка общая, рисовать на ней нельзя"""
+    key = font, text, tuple(Color(color)), antialias
+    surface = _get_cached(key)
+    if surface is None:
+        surface = _put_cached(key, font.render(text, antialias, color))
+    return surface
+
+
+def render_number(font: Font, text: str, color: Color) -> Surface:
+    """
+    Надпись вроде '+15' или '-7', собранная из закэшированных картинок символов.
+    Новые числа не проходят через растеризацию шрифта, только склейку
+    """
+    key = font, text, tuple(Color(color)), 'glyphs'
+    surface = _get_cached(key)
+    if surface is not None:
+        return surface
+
+    glyphs = [render_text(font, char, color) for char in text]
+    surface = Surface((sum(glyph.get_width() for glyph in glyphs), max(glyph.get_height() for glyph in glyphs)),
+                      pygame.SRCALPHA)
+    x = 0
+    for glyph in glyphs:
+        # символы не пересекаются, поэтому максимум по каналам просто копирует их на прозрачный фон
+        surface.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        x += glyph.get_width()
+    return _put_cached(key, surface)
+
+
+def is_number(text: str) -> bool:
+    return text.lstrip('+-').isdigit()
@@ -1,7 +1,64 @@
-class UniqueIdGenerator:
-    last_id = 0
+from collections import deque
 
-    @classmethod
-    def generate_id(cls) -> str:
-        cls.last_id += 1
-        return str(cls.last_id)
+INDEX_BITS = 24
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+class EntityIdAllocator:
+    """
+    Выдаёт целые id вида (поколение << INDEX_BITS) | индекс.
+    Освобождённый индекс переиспользуется со следующим поколением,
+    поэтому старая ссылка на удалённую сущность не совпадёт с новой сущностью на том же индексе
+    """
+
+    def __init__(self):
+        self._generations: list[int] = []
+        self._alive = bytearray()
+        self._free_indexes: deque[int] = deque()
+
+    def allocate(self) -> int:
+        index = None
+        while self._free_indexes:
+            index = self._free_indexes.popleft()
+            if not self._alive[index]:
+                break  # индекс мог быть занят через claim
+            index = None
+
+        if index is None:
+            index = len(self._generations)
+            self._generations.append(0)
+            self._alive.append(0)
+
+        self._alive[index] = 1
+        return (self._generations[index] << INDEX_BITS) | index
+
+    def claim(self, entity_id: int) -> None:
+        """Занимает id, выданный другим аллокатором (клиент получает id от сервера)"""
+        index, generation = entity_id & INDEX_MASK, entity_id >> INDEX_BITS
+        missing = index + 1 - len(self._generations)
+        if missing > 0:
+            self._generations += [0] * missing
+            self._alive += bytes(missing)
+
+        self._generations[index] = generation
+        self._alive[index] = 1
+
+    def release(self, entity_id: int) -> None:
+        index = entity_id & INDEX_MASK
+        self._alive[index] = 0
+        self._generations[index] += 1
+        self._free_indexes.append(index)
+
+    def is_alive(self, entity_id: int) -> bool:
+        index = entity_id & INDEX_MASK
+        return index < len(self._generations) and self._alive[index] == 1 \
+            and self._generations[index] == entity_id >> INDEX_BITS
+
+
+def entity_id_to_wire(entity_id: int) -> str:
+    """id в протоколе передаются строками, как и раньше"""
+    return str(entity_id)
+
+
+def entity_id_from_wire(wire_id: str | int) -> int:
+    return int(wire_id)